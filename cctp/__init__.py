@@ -1,6 +1,32 @@
 """Init."""
 # TODO: write proper docstring
 
-from . import christofides, cnn, cr, graphs, tsp, utils
+from . import (
+    blocked,
+    cache,
+    christofides,
+    cnn,
+    cr,
+    graphs,
+    instances,
+    local_search,
+    matching,
+    pipeline,
+    tsp,
+    utils,
+)
 
-__all__ = ["christofides", "cnn", "cr", "graphs", "tsp", "utils"]
+__all__ = [
+    "blocked",
+    "cache",
+    "christofides",
+    "cnn",
+    "cr",
+    "graphs",
+    "instances",
+    "local_search",
+    "matching",
+    "pipeline",
+    "tsp",
+    "utils",
+]
@@ -0,0 +1,195 @@
+"""Index structure for the blocked edges of a CCTP instance.
+
+This module provides a blocked-edge index answering membership queries with
+integer node keys, so that the solvers never build and hash edge tuples in
+their inner loops. Depending on the density of the blockages, edges are kept
+either in per-node neighbour sets or in a flat n x n byte matrix.
+"""
+
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+
+from .types import Edge, Node
+
+# Fraction of all node pairs above which the dense byte matrix is used
+DENSE_FRACTION = 1 / 32
+
+
+class BlockedEdgeIndex:
+    """Set of blocked edges with constant-time integer-keyed lookups.
+
+    Nodes are the integers 0 to n - 1. Sparse blockages are stored as one set
+    of blocked neighbours per node, which also gives iteration over the blocked
+    edges of a node in time proportional to its blocked degree. Dense
+    blockages are stored as a flat byte matrix indexed by u * n + v.
+
+    The index can be used wherever a set of ordered edge tuples was expected:
+    it supports `in`, `len` and iteration over ordered node pairs.
+
+    Attributes:
+        n: Number of nodes of the graph
+    """
+
+    def __init__(
+        self,
+        n: int,
+        blocked_edges: Iterable[Edge] = (),
+        dense: bool | None = None,
+    ) -> None:
+        """Build the index of a set of blocked edges.
+
+        Args:
+            n: Number of nodes of the graph
+            blocked_edges: Edges that cannot be traversed
+            dense: Force the dense (True) or sparse (False) representation,
+                chosen from the number of blocked edges when None
+        """
+        blocked_edges = list(blocked_edges)
+        if dense is None:
+            dense = len(blocked_edges) > DENSE_FRACTION * n * (n - 1) / 2
+
+        self.n = n
+        self._size = 0
+        self._neighbors: list[set[Node]] | None = None
+        self._matrix: bytearray | None = None
+
+        if dense:
+            self._matrix = bytearray(n * n)
+        else:
+            self._neighbors = [set() for _ in range(n)]
+
+        for u, v in blocked_edges:
+            self.add(u, v)
+
+    @classmethod
+    def from_matrix(cls, blocked_matrix: np.ndarray) -> "BlockedEdgeIndex":
+        """Build a dense index from a boolean matrix of blocked edges.
+
+        Args:
+            blocked_matrix: (n, n) array that is True for blocked edges, only
+                one of the entries (u, v) and (v, u) needs to be set
+
+        Returns:
+            Index using the dense representation
+        """
+        blocked_matrix = np.asarray(blocked_matrix, dtype=np.bool_)
+        blocked_matrix = blocked_matrix | blocked_matrix.T
+        np.fill_diagonal(blocked_matrix, False)
+
+        index = cls(len(blocked_matrix), dense=True)
+        index._matrix[:] = blocked_matrix.tobytes()
+        index._size = int(np.count_nonzero(blocked_matrix)) // 2
+        return index
+
+    @property
+    def dense(self) -> bool:
+        """Whether the index uses the dense byte matrix representation."""
+        return self._matrix is not None
+
+    def add(self, u: Node, v: Node) -> None:
+        """Mark edge (u, v) as blocked.
+
+        Args:
+            u: First node of the edge
+            v: Second node of the edge
+        """
+        if self.is_blocked(u, v):
+            return
+
+        if self._matrix is None:
+            self._neighbors[u].add(v)
+            self._neighbors[v].add(u)
+        else:
+            self._matrix[u * self.n + v] = 1
+            self._matrix[v * self.n + u] = 1
+        self._size += 1
+
+    def is_blocked(self, u: Node, v: Node) -> bool:
+        """Check whether edge (u, v) is blocked.
+
+        Args:
+            u: First node of the edge
+            v: Second node of the edge
+
+        Returns:
+            True if the edge cannot be traversed
+        """
+        if self._matrix is None:
+            return v in self._neighbors[u]
+        return self._matrix[u * self.n + v] == 1
+
+    def neighbors(self, u: Node) -> Iterable[Node]:
+        """Return the nodes v such that edge (u, v) is blocked.
+
+        Args:
+            u: Node whose blocked edges are requested
+
+        Returns:
+            Blocked neighbours of u, which must not be modified
+        """
+        if self._matrix is None:
+            return self._neighbors[u]
+        row = np.frombuffer(
+            self._matrix, dtype=np.uint8, count=self.n, offset=u * self.n
+        )
+        return np.flatnonzero(row).tolist()
+
+    def degree(self, u: Node) -> int:
+        """Return the number of blocked edges incident to u."""
+        if self._matrix is None:
+            return len(self._neighbors[u])
+        return self._matrix.count(1, u * self.n, (u + 1) * self.n)
+
+    def as_matrix(self) -> np.ndarray:
+        """Return the blocked edges as a boolean adjacency matrix.
+
+        Returns:
+            Symmetric (n, n) array that is True for blocked edges, sharing
+            memory with the index in the dense representation
+        """
+        if self._matrix is not None:
+            return np.frombuffer(self._matrix, dtype=np.bool_).reshape(
+                self.n, self.n
+            )
+
+        matrix = np.zeros((self.n, self.n), dtype=np.bool_)
+        for u, v in self:
+            matrix[u, v] = matrix[v, u] = True
+        return matrix
+
+    def __contains__(self, blocked_edge: Edge) -> bool:
+        """Check whether an edge given as a node pair is blocked."""
+        u, v = blocked_edge
+        return self.is_blocked(u, v)
+
+    def __iter__(self) -> Iterator[Edge]:
+        """Iterate over the blocked edges as ordered node pairs."""
+        for u in range(self.n):
+            for v in sorted(self.neighbors(u)):
+                if u < v:
+                    yield (u, v)
+
+    def __len__(self) -> int:
+        """Return the number of blocked edges."""
+        return self._size
+
+
+# BlockedEdges is any representation of blocked edges accepted by the solvers
+BlockedEdges = BlockedEdgeIndex | set[Edge]
+
+
+def as_blocked_index(blocked_edges: BlockedEdges, n: int) -> BlockedEdgeIndex:
+    """Return the index representation of a set of blocked edges.
+
+    Args:
+        blocked_edges: Blocked edges as an index or a set of node pairs
+        n: Number of nodes of the graph
+
+    Returns:
+        The blocked edges themselves if they already are an index, a new index
+        built from them otherwise
+    """
+    if isinstance(blocked_edges, BlockedEdgeIndex):
+        return blocked_edges
+    return BlockedEdgeIndex(n, blocked_edges)
@@ -0,0 +1,216 @@
+"""Content-addressed cache of Christofides tours.
+
+This module provides a cache of Christofides tours keyed by a fingerprint of
+the weights or coordinates of a graph, so that solving the same graph against
+many different sets of blocked edges computes its tour only once. Recently
+used tours are kept in memory, and can also be stored on disk as compact
+integer arrays that survive process restarts.
+"""
+
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path as FilePath
+
+import numpy as np
+
+from .christofides import christofides_tsp
+from .instances import (
+    ArrayGraph,
+    GraphLike,
+    as_array_graph,
+    label_nodes,
+    node_labels,
+)
+from .types import Path, Weight
+
+# Number of tours kept in memory by default
+CACHE_SIZE = 128
+
+
+def graph_fingerprint(graph: ArrayGraph, *options: str) -> str:
+    """Compute a fingerprint identifying the content of a graph.
+
+    Graphs whose coordinates are known are identified by them, since their
+    weights are the Euclidean distances between the coordinates, and other
+    graphs by their full weight matrix.
+
+    Args:
+        graph: Array-backed graph
+        *options: Names of the settings the cached value depends on, such as
+            the matching strategy of the tour
+
+    Returns:
+        Hexadecimal BLAKE2b digest of the graph content and options
+    """
+    if graph.points is not None:
+        kind, data = b"points", graph.points
+    else:
+        kind, data = b"weights", graph.weights
+
+    digest = hashlib.blake2b(kind, digest_size=16)
+    digest.update(np.int64(len(graph)).tobytes())
+    digest.update(np.ascontiguousarray(data, dtype=np.float64))
+    for option in options:
+        digest.update(b"\0" + option.encode())
+    return digest.hexdigest()
+
+
+class TourCache:
+    """Least recently used cache of tours with an optional on-disk store.
+
+    Tours are stored as closed paths in int32 arrays. When a directory is set,
+    every stored tour is also written there as a .npy file named after its
+    key, and tours missing from memory are looked up on disk before being
+    considered absent.
+
+    Attributes:
+        maxsize: Maximum number of tours kept in memory
+        directory: Directory of the on-disk store, or None to keep tours in
+            memory only
+    """
+
+    def __init__(
+        self,
+        maxsize: int = CACHE_SIZE,
+        directory: str | os.PathLike | None = None,
+    ) -> None:
+        """Create an empty cache.
+
+        Args:
+            maxsize: Maximum number of tours kept in memory
+            directory: Directory of the on-disk store (optional), created if
+                it does not exist
+
+        Raises:
+            ValueError: If the maximum size is not positive
+        """
+        if maxsize < 1:
+            msg = f"maxsize must be positive, got {maxsize}"
+            raise ValueError(msg)
+
+        self.maxsize = maxsize
+        self.directory = None if directory is None else FilePath(directory)
+        self._tours: OrderedDict[str, np.ndarray] = OrderedDict()
+
+    def get(self, key: str) -> Path | None:
+        """Return the tour stored under a key.
+
+        Args:
+            key: Fingerprint of the tour
+
+        Returns:
+            The closed tour, or None if it is not in the cache
+        """
+        tour = self._tours.get(key)
+        if tour is not None:
+            self._tours.move_to_end(key)
+            return tour.tolist()
+
+        if self.directory is None:
+            return None
+        try:
+            tour = np.load(self.directory / f"{key}.npy")
+        except (FileNotFoundError, ValueError):
+            return None
+
+        self._remember(key, tour)
+        return tour.tolist()
+
+    def put(self, key: str, tour: Path) -> None:
+        """Store a tour under a key.
+
+        Args:
+            key: Fingerprint of the tour
+            tour: Closed tour to store
+        """
+        tour = np.asarray(tour, dtype=np.int32)
+        self._remember(key, tour)
+
+        if self.directory is not None:
+            # write to a temporary file first, so that concurrent readers
+            # never see a partially written tour
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=self.directory, suffix=".npy", delete=False
+            ) as temporary_file:
+                np.save(temporary_file, tour)
+            os.replace(temporary_file.name, self.directory / f"{key}.npy")
+
+    def clear(self) -> None:
+        """Remove all tours from memory, leaving the on-disk store intact."""
+        self._tours.clear()
+
+    def _remember(self, key: str, tour: np.ndarray) -> None:
+        """Keep a tour in memory, evicting the least recently used ones."""
+        self._tours[key] = tour
+        self._tours.move_to_end(key)
+        while len(self._tours) > self.maxsize:
+            self._tours.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        """Check whether a tour is stored in memory or on disk."""
+        if key in self._tours:
+            return True
+        return (
+            self.directory is not None
+            and (self.directory / f"{key}.npy").exists()
+        )
+
+    def __len__(self) -> int:
+        """Return the number of tours kept in memory."""
+        return len(self._tours)
+
+
+# Cache used by the solvers when they compute their own Christofides tour
+DEFAULT_TOUR_CACHE = TourCache()
+
+
+def cached_christofides_tsp(
+    graph: GraphLike,
+    matching: str = "exact",
+    starts: int = 1,
+    local_search_time: float | None = None,
+    cache: TourCache | None = None,
+) -> tuple[Path, Weight]:
+    """Solve TSP with the Christofides algorithm, reusing cached tours.
+
+    Args:
+        graph: Undirected weighted graph where edges have a 'weight' attribute,
+            or array-backed graph
+        matching: Matching strategy of the Christofides algorithm
+        starts: Number of starting vertices of the Eulerian circuit to try
+        local_search_time: Time budget in seconds of the local search
+            improving the tour, which is skipped when None
+        cache: Cache of tours, the default cache when None
+
+    Returns:
+        A tuple containing the Hamiltonian cycle as a list of nodes and the
+        total weight of the tour
+    """
+    if cache is None:
+        cache = DEFAULT_TOUR_CACHE
+    labels = node_labels(graph)
+    graph = as_array_graph(graph)
+
+    key = graph_fingerprint(
+        graph,
+        "christofides",
+        matching,
+        f"starts={starts}",
+        f"local_search_time={local_search_time}",
+    )
+    tour = cache.get(key)
+    if tour is None:
+        tour, tour_weight = christofides_tsp(
+            graph,
+            matching=matching,
+            starts=starts,
+            local_search_time=local_search_time,
+        )
+        cache.put(key, tour)
+    else:
+        tour_weight = graph.path_weight(tour)
+
+    return label_nodes(tour, labels), tour_weight
@@ -5,17 +5,34 @@ polynomial-time approximation algorithm for the Traveling Salesman Problem (TSP)
 that guarantees solutions within 1.5 times the optimal solution for metric TSPs.
 """
 
-import itertools
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
-import networkx as nx
-from networkx.algorithms.euler import eulerian_circuit
-from networkx.algorithms.matching import min_weight_matching
+import numpy as np
+from scipy import sparse, spatial
+from scipy.sparse import csgraph
 
-from .types import Node, Path, Weight
-from .utils import calculate_path_weight
+from .instances import (
+    ArrayGraph,
+    GraphLike,
+    as_array_graph,
+    label_nodes,
+    node_labels,
+)
+from .local_search import improve_tour
+from .matching import perfect_matching
+from .types import Edge, Node, Path, Weight
 
 
-def christofides_tsp(graph: nx.Graph) -> tuple[Path, Weight]:
+def christofides_tsp(
+    graph: GraphLike,
+    matching: str = "exact",
+    starts: int = 1,
+    local_search_time: float | None = None,
+    return_info: bool = False,
+) -> tuple[Path, Weight] | tuple[Path, Weight, dict[str, Weight | Node]]:
     """Solve TSP approximately using the Christofides algorithm.
 
     Implements the Christofides approximation algorithm which guarantees a tour
@@ -28,59 +45,416 @@ def christofides_tsp(graph: nx.Graph) -> tuple[Path, Weight]:
     4. Find an Eulerian circuit in this multigraph
     5. Convert to a Hamiltonian cycle by shortcutting
 
+    The guarantee only holds with the exact matching. The greedy matching
+    strategies trade it for speed on large instances. Eulerian circuits from
+    several starting vertices can be shortcut, keeping the cheapest tour, and
+    the tour can then be improved by a local search within a time budget.
+
     Args:
-        graph: Undirected weighted graph where edges have a 'weight' attribute
+        graph: Undirected weighted graph where edges have a 'weight' attribute,
+            or array-backed graph
+        matching: Matching strategy, 'exact' for a minimum weight perfect
+            matching, 'greedy' or 'greedy_2opt' for the greedy heuristics
+        starts: Number of starting vertices of the Eulerian circuit to try
+        local_search_time: Time budget in seconds of the 2-opt and Or-opt
+            local search improving the tour, which is skipped when None
+        return_info: Whether to also return information about the run
 
     Returns:
         A tuple containing the Hamiltonian cycle as a list of nodes and the
-        total weight of the tour
+        total weight of the tour, followed when requested by a dictionary
+        holding the weights of the spanning tree ('tree_weight') and of the
+        matching ('matching_weight'), the starting vertex of the Eulerian
+        circuit whose tour was kept ('start') and the weight of that tour
+        before the local search ('shortcut_weight')
+
+    Raises:
+        ValueError: If the matching strategy is unknown or the number of
+            starts is not positive
     """
+    if starts < 1:
+        msg = f"starts must be positive, got {starts}"
+        raise ValueError(msg)
+
+    labels = node_labels(graph)
+    distances = as_array_graph(graph)
+
     # 1. Calculate a minimum weight spanning tree T of G
-    minimum_spanning_tree = nx.minimum_spanning_tree(graph)
+    minimum_spanning_tree = minimum_spanning_tree_edges(distances)
 
     # 2. Let I be the set of vertices with odd degree in T, calculate a minimum
     # weight perfect matching M in the subgraph induced by the vertices of I
-    odd_degree_vertices: list[Node] = [
-        node
-        for node, degree in minimum_spanning_tree.degree()
-        if degree % 2 == 1
-    ]
-
-    # Create the subgraph induces by I
-    odd_vertices_subgraph = nx.Graph()
-    odd_vertex_pairs = itertools.combinations(odd_degree_vertices, 2)
-    for vertex_u, vertex_v in odd_vertex_pairs:
-        odd_vertices_subgraph.add_edge(
-            vertex_u, vertex_v, weight=graph[vertex_u][vertex_v]["weight"]
-        )
+    degrees = np.bincount(
+        np.ravel(np.asarray(minimum_spanning_tree, dtype=np.intp)),
+        minlength=len(distances),
+    )
+    odd_degree_vertices: list[Node] = np.flatnonzero(degrees % 2 == 1).tolist()
 
-    # Find minimum weight perfect matching
-    minimum_weight_matching = min_weight_matching(odd_vertices_subgraph)
+    # Find minimum weight perfect matching on the subgraph induced by I, or
+    # a greedy approximation of it
+    odd_vertices_weights = distances.submatrix(odd_degree_vertices)
+    minimum_weight_matching = [
+        (odd_degree_vertices[i], odd_degree_vertices[j])
+        for i, j in perfect_matching(odd_vertices_weights, matching)
+    ]
 
     # 3. Define a multigraph H from the edges of M and T
-    eulerian_multigraph = nx.MultiGraph(minimum_spanning_tree)
-    for vertex_u, vertex_v in minimum_weight_matching:
-        eulerian_multigraph.add_edge(
-            vertex_u, vertex_v, weight=graph[vertex_u][vertex_v]["weight"]
-        )
+    tree_weights = [distances.weight(u, v) for u, v in minimum_spanning_tree]
+    multigraph_edges = eulerian_multigraph_edges(
+        minimum_spanning_tree, tree_weights, minimum_weight_matching
+    )
 
     # 4. Find a Eulerian cycle in H (H is Eulerian because it is connected and
     # all vertices have even degree)
-    eulerian_cycle = list(eulerian_circuit(eulerian_multigraph))
-
     # 5. Transform the Eulerian cycle into a Hamiltonian cycle by removing any
-    # double passages on certain vertices
-    hamiltonian_cycle = shortcut_eulerian_path(
-        [vertex for vertex, _ in eulerian_cycle]
+    # double passages on certain vertices, trying several starting vertices
+    # for the cycle when requested
+    hamiltonian_cycle, total_tour_weight, start = multi_start_shortcut(
+        distances, multigraph_edges, starts
     )
+    shortcut_weight = total_tour_weight
 
-    # Calculate total weight of the tour
-    total_tour_weight = calculate_path_weight(graph, hamiltonian_cycle)
+    # Optionally shorten the Hamiltonian cycle with a local search
+    if local_search_time is not None:
+        hamiltonian_cycle, total_tour_weight = improve_tour(
+            distances, hamiltonian_cycle, local_search_time
+        )
 
+    hamiltonian_cycle = label_nodes(hamiltonian_cycle, labels)
+
+    if return_info:
+        info = {
+            "tree_weight": sum(tree_weights),
+            "matching_weight": sum(
+                distances.weight(u, v) for u, v in minimum_weight_matching
+            ),
+            "start": label_nodes([start], labels)[0],
+            "shortcut_weight": shortcut_weight,
+        }
+        return hamiltonian_cycle, total_tour_weight, info
     return hamiltonian_cycle, total_tour_weight
 
 
-def shortcut_eulerian_path(eulerian_path: list[Node]) -> Path:
+def minimum_spanning_tree_edges(graph: ArrayGraph) -> list[Edge]:
+    """Compute the edges of a minimum spanning tree of a graph.
+
+    Euclidean graphs whose node coordinates are known have a minimum spanning
+    tree made of edges of their Delaunay triangulation, which is searched
+    instead of the complete graph. Other graphs, and degenerate point sets
+    that cannot be triangulated, use dense Prim.
+
+    Args:
+        graph: Array-backed graph
+
+    Returns:
+        List of the n - 1 edges of the tree as ordered node pairs
+    """
+    if graph.points is not None:
+        try:
+            triangulation = spatial.Delaunay(graph.points)
+        except (spatial.QhullError, ValueError):
+            triangulation = None
+
+        # coincident points are left out of the triangulation
+        if triangulation is not None and len(triangulation.coplanar) == 0:
+            return delaunay_minimum_spanning_tree_edges(triangulation)
+
+    return dense_minimum_spanning_tree_edges(graph)
+
+
+def delaunay_minimum_spanning_tree_edges(
+    triangulation: spatial.Delaunay,
+) -> list[Edge]:
+    """Compute a Euclidean minimum spanning tree from a Delaunay triangulation.
+
+    The triangulation has O(n) edges, so running Kruskal on them takes
+    O(n log n) time without ever considering all the n^2 node pairs.
+
+    Args:
+        triangulation: Delaunay triangulation of the node coordinates
+
+    Returns:
+        List of the n - 1 edges of the tree as ordered node pairs
+    """
+    points = triangulation.points
+    n = len(points)
+
+    # every triangle side is an edge, shared sides are deduplicated through
+    # their rank u * n + v
+    simplices = np.sort(triangulation.simplices, axis=1).astype(np.int64)
+    edge_ranks = np.unique(
+        np.concatenate(
+            (
+                simplices[:, 0] * n + simplices[:, 1],
+                simplices[:, 1] * n + simplices[:, 2],
+                simplices[:, 0] * n + simplices[:, 2],
+            )
+        )
+    )
+    rows, cols = np.divmod(edge_ranks, n)
+
+    lengths = np.hypot(*(points[rows] - points[cols]).T)
+    triangle_graph = sparse.csr_array((lengths, (rows, cols)), shape=(n, n))
+
+    tree = csgraph.minimum_spanning_tree(triangle_graph).tocoo()
+    return [
+        (min(u, v), max(u, v))
+        for u, v in zip(tree.row.tolist(), tree.col.tolist(), strict=True)
+    ]
+
+
+def dense_minimum_spanning_tree_edges(graph: ArrayGraph) -> list[Edge]:
+    """Compute the edges of a minimum spanning tree with Prim's algorithm.
+
+    Keeps for every node outside the tree its distance to the tree, and adds
+    the closest node one at a time. Each step reads a single row of weights
+    and updates the distances with vectorized operations, which gives O(n^2)
+    time for dense graphs. Coordinate-backed graphs compute their rows on
+    demand, so that the full distance matrix is never built.
+
+    Args:
+        graph: Array-backed graph
+
+    Returns:
+        List of the n - 1 edges of the tree as ordered node pairs
+
+    Raises:
+        ValueError: If the graph is not connected
+    """
+    n = len(graph)
+    in_tree = np.zeros(n, dtype=np.bool_)
+    tree_distances = np.full(n, np.inf)
+    closest_tree_nodes = np.zeros(n, dtype=np.intp)
+
+    tree_edges = []
+    node = 0
+    for _ in range(n - 1):
+        # add the node to the tree and update the distances with its row
+        in_tree[node] = True
+        tree_distances[node] = np.inf
+        node_weights = graph.rows([node])[0]
+        closer = (node_weights < tree_distances) & ~in_tree
+        tree_distances[closer] = node_weights[closer]
+        closest_tree_nodes[closer] = node
+
+        # the next node is the closest one to the tree
+        node = int(np.argmin(tree_distances))
+        if in_tree[node]:
+            msg = "graph must be connected to have a spanning tree"
+            raise ValueError(msg)
+
+        parent = int(closest_tree_nodes[node])
+        tree_edges.append((min(parent, node), max(parent, node)))
+
+    return tree_edges
+
+
+def eulerian_multigraph_edges(
+    tree_edges: Sequence[Edge] | np.ndarray,
+    tree_weights: Sequence[Weight] | np.ndarray,
+    matched_pairs: Sequence[Edge] | np.ndarray,
+) -> np.ndarray:
+    """List the edges of the Eulerian multigraph in the networkx order.
+
+    The Eulerian circuit, hence the shortcut tour, depends on the order in
+    which every node lists its edges. Edges are ordered as in the copy of the
+    multigraph that networkx walks when built from a Kruskal spanning tree:
+    each node lists its smaller neighbours by increasing label, then its
+    larger tree neighbours by increasing weight and label, then its larger
+    matched vertex. A matched pair that is also a tree edge follows its tree
+    edge. Sorting the edges by smaller endpoint with these keys gives every
+    node this order.
+
+    Args:
+        tree_edges: Edges of the minimum spanning tree
+        tree_weights: Weights of the tree edges
+        matched_pairs: Edges of the perfect matching on the odd-degree
+            vertices of the tree
+
+    Returns:
+        (m, 2) array of the edges of the multigraph as ordered node pairs
+    """
+    tree_edges = np.sort(
+        np.reshape(np.asarray(tree_edges, dtype=np.intp), (-1, 2)), axis=1
+    )
+    tree_weights = np.asarray(tree_weights, dtype=np.float64)
+    matched_pairs = np.sort(
+        np.reshape(np.asarray(matched_pairs, dtype=np.intp), (-1, 2)), axis=1
+    )
+    edges = np.concatenate((tree_edges, matched_pairs))
+    if len(tree_edges) == 0:
+        return edges
+
+    # find the tree edge joining the same vertices as every matched pair
+    n = int(edges.max()) + 1
+    tree_keys = tree_edges[:, 0] * n + tree_edges[:, 1]
+    pair_keys = matched_pairs[:, 0] * n + matched_pairs[:, 1]
+    tree_order = np.argsort(tree_keys)
+    twins = tree_order[
+        np.minimum(
+            np.searchsorted(tree_keys, pair_keys, sorter=tree_order),
+            len(tree_keys) - 1,
+        )
+    ]
+    parallel = tree_keys[twins] == pair_keys
+
+    # every vertex has a single matched pair, so that the weights of the
+    # other matched pairs never decide the order
+    after_tree = np.concatenate((np.zeros(len(tree_edges), bool), ~parallel))
+    weights = np.concatenate(
+        (tree_weights, np.where(parallel, tree_weights[twins], 0.0))
+    )
+    return edges[np.lexsort((edges[:, 1], weights, after_tree, edges[:, 0]))]
+
+
+def eulerian_circuit(n: int, edges: np.ndarray, source: Node = 0) -> np.ndarray:
+    """Find an Eulerian circuit of a multigraph with Hierholzer's algorithm.
+
+    The multigraph is stored as a CSR adjacency listing, for every node, the
+    other endpoint and the index of each incident edge in the order of the
+    edges, along with a flag per edge marking whether the circuit already used
+    it. The walk keeps its current trail on an explicit stack and moves nodes
+    to the circuit once all their edges are used, which takes O(n + m) time.
+    As in networkx, the walk follows the first unused edge of every node and
+    the circuit is given in the order in which nodes leave the trail.
+
+    Args:
+        n: Number of nodes of the multigraph
+        edges: (m, 2) array of the edges, parallel edges being repeated
+        source: Node at which the circuit starts and ends
+
+    Returns:
+        Array of the m + 1 nodes of the circuit, whose first and last nodes
+        are the source
+
+    Raises:
+        ValueError: If the multigraph has no Eulerian circuit
+    """
+    edges = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+    m = len(edges)
+
+    # each edge appears in the adjacency of both of its endpoints, the slots
+    # 2i and 2i + 1 of the endpoints being those of edge i
+    endpoints = np.ravel(edges)
+    degrees = np.bincount(endpoints, minlength=n)
+    if np.any(degrees % 2 == 1):
+        msg = "multigraph must have even degrees to have an Eulerian circuit"
+        raise ValueError(msg)
+
+    order = np.argsort(endpoints, kind="stable")
+    offsets = np.zeros(n + 1, dtype=np.intp)
+    np.cumsum(degrees, out=offsets[1:])
+    adjacent_nodes = endpoints[order ^ 1].tolist()
+    adjacent_edges = (order // 2).tolist()
+
+    used_edges = bytearray(m)
+    next_slots = offsets[:-1].tolist()
+    end_slots = offsets[1:].tolist()
+
+    trail = [source]
+    circuit: list[Node] = []
+    while trail:
+        node = trail[-1]
+
+        # skip the edges already used from the other endpoint
+        slot = next_slots[node]
+        end_slot = end_slots[node]
+        while slot < end_slot and used_edges[adjacent_edges[slot]]:
+            slot += 1
+
+        if slot == end_slot:
+            next_slots[node] = slot
+            circuit.append(trail.pop())
+        else:
+            next_slots[node] = slot + 1
+            used_edges[adjacent_edges[slot]] = 1
+            trail.append(adjacent_nodes[slot])
+
+    if len(circuit) != m + 1:
+        msg = "multigraph must be connected to have an Eulerian circuit"
+        raise ValueError(msg)
+
+    return np.array(circuit, dtype=np.intp)
+
+
+# Number of multigraph edges walked over all the starts from which the starts
+# are spread over a process pool, whose startup takes tens of milliseconds
+PARALLEL_MIN_EDGES = 200_000
+
+
+def multi_start_shortcut(
+    graph: ArrayGraph, multigraph_edges: np.ndarray, starts: int
+) -> tuple[Path, Weight, Node]:
+    """Shortcut Eulerian circuits from several starts and keep the best.
+
+    The circuit found by Hierholzer's algorithm, and therefore the order in
+    which the vertices first occur, depends on its starting vertex. Circuits
+    are walked from evenly spaced starting vertices, the first one being node
+    0. Walking a circuit is interpreted Python, so the starts of large
+    multigraphs are spread over a process pool when several CPUs are
+    available, and only the tours are sent back to be weighted. Smaller
+    multigraphs are walked in process, a circuit of a thousand edges taking
+    about a millisecond.
+
+    Args:
+        graph: Array-backed graph
+        multigraph_edges: (m, 2) array of the edges of the Eulerian multigraph
+        starts: Number of starting vertices to try
+
+    Returns:
+        Tuple containing the cheapest Hamiltonian cycle, the one starting from
+        node 0 on ties, its total weight and the starting vertex of the
+        Eulerian circuit it was shortcut from
+    """
+    n = len(graph)
+    sources = np.unique(
+        np.linspace(0, n, min(starts, n), endpoint=False).astype(np.intp)
+    ).tolist()
+    shortcut_from = partial(shortcut_eulerian_circuit, n, multigraph_edges)
+
+    workers = min(len(sources), os.cpu_count() or 1)
+    if workers == 1 or (
+        len(sources) * len(multigraph_edges) < PARALLEL_MIN_EDGES
+    ):
+        tours = [shortcut_from(source) for source in sources]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            tours = list(
+                executor.map(
+                    shortcut_from,
+                    sources,
+                    chunksize=-(-len(sources) // workers),
+                )
+            )
+
+    tour_weights = [graph.path_weight(tour) for tour in tours]
+    best = int(np.argmin(tour_weights))
+    return tours[best], tour_weights[best], sources[best]
+
+
+def shortcut_eulerian_circuit(
+    n: int, multigraph_edges: np.ndarray, source: Node
+) -> Path:
+    """Shortcut the Eulerian circuit of a multigraph from a starting vertex.
+
+    Args:
+        n: Number of nodes of the multigraph
+        multigraph_edges: (m, 2) array of the edges of the Eulerian multigraph
+        source: Node at which the Eulerian circuit starts
+
+    Returns:
+        Hamiltonian cycle obtained by shortcutting the circuit, rotated to
+        start and end at node 0
+    """
+    eulerian_cycle = eulerian_circuit(n, multigraph_edges, source)
+    tour = shortcut_eulerian_path(eulerian_cycle)
+    if tour[0] != 0:
+        position = tour.index(0)
+        tour = tour[position:-1] + tour[: position + 1]
+    return tour
+
+
+def shortcut_eulerian_path(eulerian_path: Sequence[Node] | np.ndarray) -> Path:
     """Convert an Eulerian path to a Hamiltonian cycle via shortcutting.
 
     Takes an Eulerian path and removes repeated vertices to create a Hamiltonian
@@ -89,22 +463,198 @@ def shortcut_eulerian_path(eulerian_path: list[Node]) -> Path:
     vertices.
 
     Args:
-        eulerian_path: List of nodes forming an Eulerian path
+        eulerian_path: Sequence or array of nodes forming an Eulerian path
 
     Returns:
         A Hamiltonian cycle (Path) with no repeated vertices except the first
         and last which should be identical
     """
-    already_visited_vertices: set[Node] = set()
-    hamiltonian_cycle: list[Node] = []
+    eulerian_path = np.asarray(eulerian_path, dtype=np.intp)
+    if len(eulerian_path) == 0:
+        return []
 
-    for vertex in eulerian_path:
-        if vertex not in already_visited_vertices:
-            already_visited_vertices.add(vertex)
-            hamiltonian_cycle.append(vertex)
+    # keep every vertex at its first occurrence only
+    _, first_occurrences = np.unique(eulerian_path, return_index=True)
+    hamiltonian_cycle: list[Node] = eulerian_path[
+        np.sort(first_occurrences)
+    ].tolist()
 
     # Add the starting vertex to complete the cycle
-    if hamiltonian_cycle and hamiltonian_cycle[0] != hamiltonian_cycle[-1]:
+    if hamiltonian_cycle[0] != hamiltonian_cycle[-1]:
         hamiltonian_cycle.append(hamiltonian_cycle[0])
 
     return hamiltonian_cycle
+
+
+def batch_christofides_tsp(
+    weights: np.ndarray, matching: str = "exact"
+) -> tuple[np.ndarray, np.ndarray]:
+    """Solve many TSP instances of the same size with Christofides at once.
+
+    The instances are stacked along a batch dimension as distance matrices.
+    The spanning trees, the odd-degree vertices, the shortcutting and the
+    tour weights are computed with vectorized operations across the batch,
+    and only the matching and the Eulerian circuit are computed instance by
+    instance. Each tour is the one christofides_tsp finds on the distance
+    matrix of its instance.
+
+    Args:
+        weights: (B, n, n) stack of distance matrices
+        matching: Matching strategy, as for christofides_tsp
+
+    Returns:
+        Tuple containing the (B, n + 1) array of the closed tours, (B, 1) for
+        single-node instances whose tour is the node alone, and the (B,)
+        array of their total weights
+
+    Raises:
+        ValueError: If the distance matrices are not stacked as (B, n, n) or
+            the instances have no nodes
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    shape = weights.shape
+    if weights.ndim == 0 or shape != (shape[0], shape[-1], shape[-1]):
+        msg = f"weights must have shape (B, n, n), got {shape}"
+        raise ValueError(msg)
+
+    batch_size, n = weights.shape[:2]
+    if n == 0:
+        msg = "instances must have at least one node"
+        raise ValueError(msg)
+    batch = np.arange(batch_size)
+
+    # 1. Calculate the minimum weight spanning trees of all the instances
+    tree_edges = batch_minimum_spanning_tree_edges(weights)
+
+    # 2. Find the odd-degree vertices of every tree, using one bincount over
+    # nodes numbered b * n + v
+    degrees = np.bincount(
+        (tree_edges + (batch * n)[:, None, None]).ravel(),
+        minlength=batch_size * n,
+    ).reshape(batch_size, n)
+    odd_degree_mask = degrees % 2 == 1
+
+    # 3-4. Match the odd-degree vertices and find an Eulerian circuit of each
+    # multigraph, instance by instance
+    eulerian_cycles = []
+    for b in range(batch_size):
+        odd_degree_vertices = np.flatnonzero(odd_degree_mask[b])
+        odd_vertices_weights = weights[b][
+            np.ix_(odd_degree_vertices, odd_degree_vertices)
+        ]
+        matched_pairs = np.reshape(
+            np.asarray(
+                perfect_matching(odd_vertices_weights, matching), dtype=np.intp
+            ),
+            (-1, 2),
+        )
+        multigraph_edges = eulerian_multigraph_edges(
+            tree_edges[b],
+            weights[b, tree_edges[b, :, 0], tree_edges[b, :, 1]],
+            odd_degree_vertices[matched_pairs],
+        )
+        eulerian_cycles.append(eulerian_circuit(n, multigraph_edges))
+
+    # 5. Shortcut all the circuits in one pass, keeping the first occurrence
+    # of every node b * n + v of the concatenated circuits
+    circuit_nodes = np.concatenate(
+        [np.empty(0, dtype=np.intp)]
+        + [cycle + b * n for b, cycle in enumerate(eulerian_cycles)]
+    )
+    _, first_occurrences = np.unique(circuit_nodes, return_index=True)
+    tours = circuit_nodes[np.sort(first_occurrences)].reshape(batch_size, n)
+    tours -= (batch * n)[:, None]
+
+    # close the tours, except those of single nodes as in christofides_tsp
+    if n > 1:
+        tours = np.concatenate((tours, tours[:, :1]), axis=1)
+
+    tour_weights = weights[batch[:, None], tours[:, :-1], tours[:, 1:]].sum(
+        axis=1
+    )
+    return tours, tour_weights
+
+
+def batch_christofides_tsp_from_points(
+    points: np.ndarray, matching: str = "exact"
+) -> tuple[np.ndarray, np.ndarray]:
+    """Solve many Euclidean TSP instances of the same size with Christofides.
+
+    Args:
+        points: (B, n, 2) stack of node coordinates
+        matching: Matching strategy, as for christofides_tsp
+
+    Returns:
+        Tuple containing the (B, n + 1) array of the closed tours and the
+        (B,) array of their total weights
+
+    Raises:
+        ValueError: If the coordinates are not stacked as (B, n, 2)
+    """
+    points = np.asarray(points, dtype=np.float64)
+    shape = points.shape
+    if shape != (*shape[:2], 2):
+        msg = f"points must have shape (B, n, 2), got {shape}"
+        raise ValueError(msg)
+
+    return batch_christofides_tsp(batch_distance_matrices(points), matching)
+
+
+def batch_distance_matrices(points: np.ndarray) -> np.ndarray:
+    """Compute the Euclidean distance matrices of a stack of point sets.
+
+    Args:
+        points: (B, n, 2) stack of node coordinates
+
+    Returns:
+        (B, n, n) stack of the pairwise distances within each point set
+    """
+    differences = points[:, :, None, :] - points[:, None, :, :]
+    return np.hypot(differences[..., 0], differences[..., 1])
+
+
+def batch_minimum_spanning_tree_edges(weights: np.ndarray) -> np.ndarray:
+    """Compute minimum spanning trees of a stack of graphs with Prim.
+
+    Runs dense Prim on all the graphs in lockstep, every step adding one node
+    to each tree with vectorized operations over the batch, so that the n - 1
+    steps are shared by the whole stack.
+
+    Args:
+        weights: (B, n, n) stack of distance matrices
+
+    Returns:
+        (B, n - 1, 2) array of the tree edges as ordered node pairs, in the
+        order dense_minimum_spanning_tree_edges adds them
+
+    Raises:
+        ValueError: If one of the graphs is not connected
+    """
+    batch_size, n = weights.shape[:2]
+    batch = np.arange(batch_size)
+    in_tree = np.zeros((batch_size, n), dtype=np.bool_)
+    tree_distances = np.full((batch_size, n), np.inf)
+    closest_tree_nodes = np.zeros((batch_size, n), dtype=np.intp)
+
+    tree_edges = np.empty((batch_size, max(n - 1, 0), 2), dtype=np.intp)
+    nodes = np.zeros(batch_size, dtype=np.intp)
+    for step in range(n - 1):
+        # add the nodes to the trees and update the distances with their rows
+        in_tree[batch, nodes] = True
+        tree_distances[batch, nodes] = np.inf
+        node_weights = weights[batch, nodes]
+        closer = (node_weights < tree_distances) & ~in_tree
+        np.copyto(tree_distances, node_weights, where=closer)
+        np.copyto(closest_tree_nodes, nodes[:, None], where=closer)
+
+        # the next nodes are the closest ones to the trees
+        nodes = np.argmin(tree_distances, axis=1)
+        if np.any(in_tree[batch, nodes]):
+            msg = "graphs must be connected to have a spanning tree"
+            raise ValueError(msg)
+
+        parents = closest_tree_nodes[batch, nodes]
+        tree_edges[:, step, 0] = np.minimum(parents, nodes)
+        tree_edges[:, step, 1] = np.maximum(parents, nodes)
+
+    return tree_edges
@@ -4,17 +4,32 @@ This module implements the Constrained Nearest Neighbor (CNN) algorithm for
 the Covering Canadian Travaller Problem (CCTP) with blocked edges.
 """
 
-import networkx as nx
-
-from .christofides import christofides_tsp
+from collections.abc import Sequence
+from typing import NamedTuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+from .blocked import BlockedEdgeIndex, BlockedEdges, as_blocked_index
+from .cache import cached_christofides_tsp
+from .instances import (
+    ArrayGraph,
+    GraphLike,
+    as_array_graph,
+    index_edges,
+    index_nodes,
+    label_nodes,
+    node_labels,
+)
 from .types import Edge, Node, Path, Weight
 from .utils import calculate_path_weight, edge
 
 
 def cnn_cctp(
-    graph: nx.Graph,
-    blocked_edges: set[Edge],
-    tour: Path = None,
+    graph: GraphLike,
+    blocked_edges: BlockedEdges,
+    tour: Sequence[Node] | None = None,
 ) -> tuple[Path, Weight]:
     """Find a near-optimal path avoiding blocked edges using CNN.
 
@@ -25,29 +40,40 @@ def cnn_cctp(
     4. Exploration phase: Complete tour using nearest neighbor approach
 
     Args:
-        graph: Complete graph with weighted edges
-        blocked_edges: Set of edges that cannot be traversed
-        tour: Already precomputed Christofides tour (optional)
+        graph: Complete graph with weighted edges, or array-backed graph
+        blocked_edges: Edges that cannot be traversed, as a set or an index
+        tour: Already precomputed Christofides tour (optional), which is only
+            read and can be shared with other solvers, looked up in the
+            default tour cache when absent
 
     Returns:
         Tuple containing the final path and its total weight
     """
+    # number the nodes of graphs with other labels from 0 to n - 1
+    labels = node_labels(graph)
+    graph = as_array_graph(graph)
+    if labels is not None:
+        blocked_edges = index_edges(blocked_edges, labels)
+        if tour is not None:
+            tour = index_nodes(tour, labels)
+    blocked_edges = as_blocked_index(blocked_edges, len(graph))
+
     if tour is None:
         # 1. Initial tour using christofides
-        tour, _ = christofides_tsp(graph)
-    tour.pop()
+        tour, _ = cached_christofides_tsp(graph)
+    tour = list(tour[:-1])
 
     # 2. shortcut - follow christofides tour as far as possible then go back to
     # the start
     visited_nodes, unvisited_nodes, known_blocked = shortcut_phase(
-        graph, tour, blocked_edges
+        tour, blocked_edges
     )
 
     # if all nodes are visited, then we can just return since we are done
     if len(unvisited_nodes) == 0:
         final_path = visited_nodes
         total_tour_weight = calculate_path_weight(graph, final_path)
-        return final_path, total_tour_weight
+        return label_nodes(final_path, labels), total_tour_weight
 
     # 3. compress - create exploration graph with unvisited nodes
     exploration_graph = create_exploration_graph(
@@ -62,29 +88,27 @@ def cnn_cctp(
     final_path = visited_nodes + exploration_path
     total_tour_weight = calculate_path_weight(graph, final_path)
 
-    return final_path, total_tour_weight
+    return label_nodes(final_path, labels), total_tour_weight
 
 
-def get_blocked_edges(u, graph, blocked_edges):
+def get_blocked_edges(u: Node, blocked_edges: BlockedEdgeIndex) -> list[Edge]:
     """Find all blocked edges connected to node u.
 
+    Reads the blocked neighbours of u from the per-node adjacency of the
+    index, in time proportional to the number of blocked edges at u.
+
     Args:
         u: Node to check for connected blocked edges
-        graph: Graph containing the edges
-        blocked_edges: Set of all blocked edges
+        blocked_edges: Index of all blocked edges
 
     Returns:
         List of blocked edges connected to node u
     """
-    return [
-        edge(u, v)
-        for v in graph.nodes()
-        if u != v and edge(u, v) in blocked_edges
-    ]
+    return [edge(u, v) for v in blocked_edges.neighbors(u)]
 
 
 def shortcut_phase(
-    graph: nx.Graph, tour: Path, blocked_edges: set[Edge]
+    tour: Path, blocked_edges: BlockedEdgeIndex
 ) -> tuple[Path, set[Node], set[Edge], Node]:
     """Follow initial tour until blocked edges are encountered.
 
@@ -92,9 +116,8 @@ def shortcut_phase(
     knowledge about the graph structure.
 
     Args:
-        graph: Graph representation
         tour: Initial tour path
-        blocked_edges: Set of edges that cannot be traversed
+        blocked_edges: Index of edges that cannot be traversed
 
     Returns:
         Tuple containing visited path, unvisited nodes, and known blocked edges
@@ -105,15 +128,15 @@ def shortcut_phase(
     known_blocked = set()
 
     u = start_node
-    known_blocked.update(get_blocked_edges(u, graph, blocked_edges))
+    known_blocked.update(get_blocked_edges(u, blocked_edges))
 
     for v in tour[1:] + [tour[0]]:
-        if edge(u, v) in blocked_edges:
+        if blocked_edges.is_blocked(u, v):
             continue
 
         visited_path.append(v)
         visited_nodes.add(v)
-        known_blocked.update(get_blocked_edges(v, graph, blocked_edges))
+        known_blocked.update(get_blocked_edges(v, blocked_edges))
         u = v
 
     if visited_path[-1] != start_node:
@@ -123,156 +146,216 @@ def shortcut_phase(
     return visited_path, unvisited_nodes, known_blocked
 
 
+class ExplorationGraph(NamedTuple):
+    """Costs of the ways to travel between the nodes left to explore.
+
+    Pairs of nodes are indexed by the positions of their nodes in `nodes`. A
+    pair can be joined either by its direct edge, which is risky when it was
+    never seen and might turn out to be blocked, or by a safe shortest path
+    through the edges known to be open.
+
+    Attributes:
+        nodes: Nodes to explore, the start node included, in increasing order
+        risky_costs: (m, m) weights of the unseen direct edges, infinite for
+            pairs whose direct edge was already seen
+        safe_costs: (m, m) costs of the safe paths, infinite for pairs that the
+            known edges do not connect
+        predecessors: (m, n) predecessor of every node on the safe paths from
+            each node to explore, as returned by scipy's dijkstra
+    """
+
+    nodes: np.ndarray
+    risky_costs: np.ndarray
+    safe_costs: np.ndarray
+    predecessors: np.ndarray
+
+
 def create_exploration_graph(
-    graph: nx.Graph,
+    graph: ArrayGraph,
     visited_nodes: Path,
     unvisited_nodes: set[Node],
     known_blocked: set[Edge],
-) -> nx.Graph:
-    """Create a multigraph for exploring unvisited nodes.
+) -> ExplorationGraph:
+    """Create the cost matrices for exploring unvisited nodes.
 
-    Builds a graph containing both direct (potentially risky) edges and safe
-    paths between nodes that need to be visited.
+    Computes both the direct (potentially risky) edges and the safe paths
+    between nodes that need to be visited. Safe paths are kept as a
+    predecessor matrix and only rebuilt for the pairs that are travelled.
 
     Args:
-        graph: Original graph
+        graph: Array-backed original graph
         visited_nodes: Nodes already visited in the shortcut phase
         unvisited_nodes: Nodes that still need to be visited
         known_blocked: Blocked edges discovered during shortcut phase
 
     Returns:
-        MultiGraph containing all possible paths for exploration
+        Exploration graph holding all possible paths for exploration
     """
-    # build correct sets for manipulation
-    visited_set = set(visited_nodes)
-    all_edges = graph.edges()
-
-    # construct state of things we know and things we do not know
-    seen_edges = {
-        (u, v) for (u, v) in all_edges if u in visited_set or v in visited_set
-    }
-    unseen_edges = set(all_edges) - seen_edges
-
-    # build knowledge graph which contains all the knowledge we currenly have
-    knowledge_graph = nx.Graph()
-    for node in graph.nodes():
-        knowledge_graph.add_node(node)
-
-    for u, v in seen_edges:
-        # since we have already seen the node, we know whether it is blocked or
-        # not
-        if (u, v) not in known_blocked:
-            knowledge_graph.add_edge(u, v, weight=graph[u][v]["weight"])
-
-    # build exploration graph which contains all the nodes we have yet to
-    # visit, as well as the starting node
+    # construct state of things we know and things we do not know: an edge
+    # was seen as soon as one of its ends was visited
+    visited_mask = np.zeros(len(graph), dtype=np.bool_)
+    visited_mask[visited_nodes] = True
+    visited_indices = np.flatnonzero(visited_mask)
+
+    # build knowledge graph which contains all the knowledge we currenly have,
+    # as a sparse matrix of the seen edges that are not blocked. Seen edges
+    # are exactly the rows of the visited nodes
+    known_weights = graph.rows(visited_indices)
+    known_weights[np.arange(len(visited_indices)), visited_indices] = np.inf
+    if known_blocked:
+        row_of = np.full(len(graph), -1)
+        row_of[visited_indices] = np.arange(len(visited_indices))
+        blocked_u, blocked_v = np.array(list(known_blocked)).T
+        for u, v in ((blocked_u, blocked_v), (blocked_v, blocked_u)):
+            from_visited = visited_mask[u]
+            known_weights[row_of[u[from_visited]], v[from_visited]] = np.inf
+
+    known_rows, known_cols = np.nonzero(np.isfinite(known_weights))
+    knowledge_graph = sparse.csr_array(
+        (
+            known_weights[known_rows, known_cols],
+            (visited_indices[known_rows], known_cols),
+        ),
+        shape=(len(graph), len(graph)),
+    )
+
+    # the exploration graph contains all the nodes we have yet to visit, as
+    # well as the starting node
     start_node = visited_nodes[0]
-    nodes_to_explore = unvisited_nodes.union({start_node})
+    nodes_to_explore = sorted(unvisited_nodes.union({start_node}))
+
+    # risky paths are the direct edges which might be blocked, the unseen
+    # edges joining two unvisited nodes
+    unvisited_to_explore = ~visited_mask[nodes_to_explore]
+    risky_costs = np.where(
+        np.logical_and.outer(unvisited_to_explore, unvisited_to_explore),
+        graph.submatrix(nodes_to_explore),
+        np.inf,
+    )
+    np.fill_diagonal(risky_costs, np.inf)
+
+    # safe paths are longer paths that pass through the knowledge graph,
+    # computed with one batched dijkstra from every node to explore
+    distances, predecessors = csgraph.dijkstra(
+        knowledge_graph,
+        directed=False,
+        indices=nodes_to_explore,
+        return_predecessors=True,
+    )
+    safe_costs = distances[:, nodes_to_explore]
+    np.fill_diagonal(safe_costs, np.inf)
 
-    exploration_graph = nx.MultiGraph()
-    for node in nodes_to_explore:
-        exploration_graph.add_node(node)
+    return ExplorationGraph(
+        np.asarray(nodes_to_explore), risky_costs, safe_costs, predecessors
+    )
 
-    # add risky paths which might be blocked
-    for u, v in unseen_edges:
-        exploration_graph.add_edge(
-            u, v, weight=graph[u][v]["weight"], path=[u, v], safe=False
-        )
 
-    # add safe path which are longer path that pass through the knowledge graph
-    unvisited_pairs = [
-        (u, v) for u in nodes_to_explore for v in nodes_to_explore if u < v
-    ]
-    for u, v in unvisited_pairs:
-        safe_path = nx.shortest_path(knowledge_graph, u, v, weight="weight")
-        path_cost = sum(
-            knowledge_graph[safe_path[i]][safe_path[i + 1]]["weight"]
-            for i in range(len(safe_path) - 1)
-        )
-        exploration_graph.add_edge(
-            u, v, weight=path_cost, path=safe_path, safe=True
-        )
+def reconstruct_path(
+    predecessors: np.ndarray, source: Node, target: Node
+) -> Path:
+    """Rebuild a shortest path from a predecessor array.
 
-    return exploration_graph
+    Args:
+        predecessors: Predecessor of every node on its shortest path from the
+            source, as returned by scipy's dijkstra
+        source: First node of the path
+        target: Last node of the path
+
+    Returns:
+        Path from source to target
+    """
+    path = [target]
+    while path[-1] != source:
+        path.append(int(predecessors[path[-1]]))
+    return path[::-1]
 
 
 def nearest_neighbor(
-    graph: nx.MultiGraph, start_node: Node, blocked_edges: set[Edge]
+    exploration_graph: ExplorationGraph,
+    start_node: Node,
+    blocked_edges: BlockedEdgeIndex,
 ) -> Path:
     """Find path visiting all nodes using nearest neighbor heuristic.
 
     Selects next node to visit based on the shortest available path that
-    doesn't contain blocked edges.
+    doesn't contain blocked edges. Nodes still to visit are tracked as a
+    boolean mask over the nodes of the exploration graph.
 
     Args:
-        graph: Exploration graph with multiple path options
+        exploration_graph: Costs of the path options between nodes
         start_node: Starting node for the exploration
-        blocked_edges: Set of edges that cannot be traversed
+        blocked_edges: Index of edges that cannot be traversed
 
     Returns:
         Path visiting all unvisited nodes and returning to start
     """
     current = start_node
-    unvisited = set(graph.nodes()) - {current}
+    unvisited = exploration_graph.nodes != current
     path = []
 
     # visit all unvisited nodes
-    while unvisited:
+    while unvisited.any():
         # find next node with best path
-        next_path = find_best_path(graph, current, unvisited, blocked_edges)
+        next_path = find_best_path(
+            exploration_graph, current, unvisited, blocked_edges
+        )
 
         # add path to result
-        if current == next_path[0]:
-            path.extend(next_path[1:])
-        else:
-            path.extend(reversed(next_path[:-1]))
+        path.extend(next_path[1:])
 
         current = path[-1]
-        unvisited.remove(current)
+        unvisited[np.searchsorted(exploration_graph.nodes, current)] = False
 
-    return_path = find_best_path(graph, current, {start_node}, blocked_edges)
+    return_path = find_best_path(
+        exploration_graph,
+        current,
+        exploration_graph.nodes == start_node,
+        blocked_edges,
+    )
 
-    path.extend(reversed(return_path[:-1]))
+    path.extend(return_path[1:])
 
     return path
 
 
 def find_best_path(
-    graph: nx.MultiGraph,
+    exploration_graph: ExplorationGraph,
     current: Node,
-    target_nodes: set[Node],
-    blocked_edges: set[Edge],
+    targets: np.ndarray,
+    blocked_edges: BlockedEdgeIndex,
 ) -> Path:
     """Find the best path from current node to one of the target nodes.
 
-    Evaluates all possible paths to target nodes, considering path safety
-    and avoiding blocked edges.
+    Takes the argmin of the cost row of the current node, where risky paths
+    whose direct edge is blocked and nodes that are not targets are masked.
+    Ties go to the lowest node, and to the risky path over the safe one. Only
+    the path that is selected is rebuilt from the predecessor matrix.
 
     Args:
-        graph: MultiGraph containing path options
+        exploration_graph: Costs of the path options between nodes
         current: Current node position
-        target_nodes: Set of potential destination nodes
-        blocked_edges: Set of edges that cannot be traversed
+        targets: Boolean mask of the potential destination nodes
+        blocked_edges: Index of edges that cannot be traversed
 
     Returns:
-        Lowest-cost valid path to one of the target nodes
+        Lowest-cost valid path from current to one of the target nodes
     """
-    min_cost = float("inf")
-    best_path = []
+    nodes, risky_costs, safe_costs, predecessors = exploration_graph
+    i = np.searchsorted(nodes, current)
 
-    for node in target_nodes:
-        u, v = edge(current, node)
-
-        for _, data in graph[u][v].items():
-            cost = data["weight"]
-            path = data["path"]
-            is_safe = data["safe"]
-
-            if not is_safe and edge(path[0], path[1]) in blocked_edges:
-                continue
+    # mask the direct edges that the current node sees blocked
+    risky_row = risky_costs[i].copy()
+    blocked_neighbors = np.fromiter(
+        blocked_edges.neighbors(current), dtype=np.intp
+    )
+    risky_row[np.isin(nodes, blocked_neighbors)] = np.inf
 
-            if cost < min_cost:
-                min_cost = cost
-                best_path = path
+    costs = np.where(targets, np.minimum(risky_row, safe_costs[i]), np.inf)
+    j = int(np.argmin(costs))
+    if np.isinf(costs[j]):
+        return []
 
-    return best_path
+    best_node = int(nodes[j])
+    if safe_costs[i, j] < risky_row[j]:
+        return reconstruct_path(predecessors[i], current, best_node)
+    return [current, best_node]
@@ -5,15 +5,32 @@ Covering Canadian Travaller Problem (CCTP), which solves
 TSP problems with a subset of edges that cannot be traversed.
 """
 
-import networkx as nx
+from collections.abc import Sequence
 
-from .christofides import christofides_tsp
-from .types import Edge, Node, Path, Weight
-from .utils import calculate_path_weight, edge
+import numpy as np
+
+from .blocked import BlockedEdgeIndex, BlockedEdges, as_blocked_index
+from .cache import cached_christofides_tsp
+from .instances import (
+    DistanceMatrix,
+    GraphLike,
+    as_array_graph,
+    index_edges,
+    index_nodes,
+    label_nodes,
+    node_labels,
+)
+from .types import Node, Path, Weight
+from .utils import calculate_path_weight
+
+# Number of positions examined first by the vectorized detour search
+DETOUR_CHUNK_SIZE = 32
 
 
 def cr_cctp(
-    graph: nx.Graph, blocked_edges: set[Edge], tour: Path = None
+    graph: GraphLike,
+    blocked_edges: BlockedEdges,
+    tour: Sequence[Node] | None = None,
 ) -> tuple[Path, Weight]:
     """Find a near-optimal path avoiding blocked edges using CR.
 
@@ -23,37 +40,57 @@ def cr_cctp(
     3. Traverse the graph using alternating directions when necessary
 
     Args:
-        graph: Complete graph with weighted edges
-        blocked_edges: Set of edges that cannot be traversed
-        tour: Already precomputed Christofides tour (optional)
+        graph: Complete graph with weighted edges, or array-backed graph
+        blocked_edges: Edges that cannot be traversed, as a set or an index
+        tour: Already precomputed Christofides tour (optional), which is only
+            read and can be shared with other solvers, looked up in the
+            default tour cache when absent
 
     Returns:
         Tuple containing the final path and its total weight
     """
+    # Number the nodes of graphs with other labels from 0 to n - 1
+    labels = node_labels(graph)
+    if labels is not None:
+        graph = as_array_graph(graph)
+        blocked_edges = index_edges(blocked_edges, labels)
+        if tour is not None:
+            tour = index_nodes(tour, labels)
+    blocked_edges = as_blocked_index(blocked_edges, len(graph))
+
+    # Matrix-backed instances afford a dense blocked matrix, on which detours
+    # are searched with vectorized kernels
+    if isinstance(graph, DistanceMatrix) and not blocked_edges.dense:
+        blocked_edges = BlockedEdgeIndex(len(graph), blocked_edges, dense=True)
+
     # Initialize the tour if not provided
     if tour is None:
-        tour, _ = christofides_tsp(graph)
-    tour.pop()  # Remove last node (duplicate of first for closed tour)
+        tour, _ = cached_christofides_tsp(graph)
+    tour = list(tour[:-1])  # Drop last node (duplicate of first node)
 
-    # Convert tour to indexed pairs for processing
+    # Convert tour to indexed pairs for processing, entry i being at position i
+    # so that every tour lookup is a direct index
     full_tour = [(i, tour[i]) for i in range(len(tour))]
+    tour_nodes = np.asarray(tour) if blocked_edges.dense else None
 
     # Find all tour segments using iterative shortcutting
-    tours = find_tour_segments(blocked_edges, full_tour)
+    tours = find_tour_segments(blocked_edges, full_tour, tour_nodes)
 
     # Add final return path if needed
-    tours = complete_tour_if_needed(blocked_edges, tours, full_tour)
+    tours = complete_tour_if_needed(blocked_edges, tours, full_tour, tour_nodes)
 
     # Construct final path from tour segments
     final_path = construct_final_path(tours, full_tour)
 
     # Calculate total weight and return
     total_tour_weight = calculate_path_weight(graph, final_path)
-    return final_path, total_tour_weight
+    return label_nodes(final_path, labels), total_tour_weight
 
 
 def find_tour_segments(
-    blocked_edges: set[Edge], full_tour: list[tuple[int, Node]]
+    blocked_edges: BlockedEdgeIndex,
+    full_tour: list[tuple[int, Node]],
+    tour_nodes: np.ndarray | None = None,
 ) -> list[list[tuple[int, Node]]]:
     """Find all tour segments through iterative shortcutting.
 
@@ -62,8 +99,10 @@ def find_tour_segments(
 
     Args:
         graph: Graph with weighted edges
-        blocked_edges: Set of edges that cannot be traversed
+        blocked_edges: Index of edges that cannot be traversed
         full_tour: Complete initial tour with indices
+        tour_nodes: Nodes of the tour as an array, enabling the vectorized
+            detour search on dense blocked edges (optional)
 
     Returns:
         List of tour segments
@@ -73,16 +112,30 @@ def find_tour_segments(
     direction = 1
     tours = []
 
+    # Positions of the tour already covered by a segment. Apart from its first
+    # entry, to_visit only ever holds entries that no segment has covered yet,
+    # so a single mask marked once per segment entry replaces searching the
+    # current segment for every entry to visit
+    visited = [False] * len(full_tour)
+
+    # States met since the last segment that covered new entries. The
+    # traversal is deterministic, so meeting one of them again means that it
+    # would cycle forever, and the reversal state is switched instead
+    remaining = len(full_tour)
+    stalled_states: set[tuple[int, tuple[tuple[int, Node], ...]]] = set()
+
     # Process tour segments until all nodes are visited
     while to_visit:
         current_tour = shortcut(
-            blocked_edges, to_visit.copy(), full_tour, direction
+            blocked_edges, to_visit, full_tour, direction, tour_nodes
         )
 
         if len(current_tour) > 1:
             tours.append(current_tour)
 
-        unvisited = [e for e in to_visit if e not in current_tour]
+        for i, _ in current_tour:
+            visited[i] = True
+        unvisited = [(i, u) for (i, u) in to_visit if not visited[i]]
 
         if not unvisited:
             break
@@ -92,6 +145,14 @@ def find_tour_segments(
             current_tour, to_visit, unvisited, reverse
         )
 
+        if len(unvisited) < remaining:
+            remaining = len(unvisited)
+            stalled_states.clear()
+        if (direction, tuple(to_visit)) in stalled_states:
+            reverse = not reverse
+            direction = -direction
+        stalled_states.add((direction, tuple(to_visit)))
+
     return tours
 
 
@@ -136,9 +197,10 @@ def update_traversal_direction(
 
 
 def complete_tour_if_needed(
-    blocked_edges: set[Edge],
+    blocked_edges: BlockedEdgeIndex,
     tours: list[list[tuple[int, Node]]],
     full_tour: list[tuple[int, Node]],
+    tour_nodes: np.ndarray | None = None,
 ) -> list[list[tuple[int, Node]]]:
     """Add a return path to complete the tour if necessary.
 
@@ -147,16 +209,18 @@ def complete_tour_if_needed(
 
     Args:
         graph: Graph with weighted edges
-        blocked_edges: Set of edges that cannot be traversed
+        blocked_edges: Index of edges that cannot be traversed
         tours: List of tour segments found so far
         full_tour: Complete initial tour with indices
+        tour_nodes: Nodes of the tour as an array, enabling the vectorized
+            detour search on dense blocked edges (optional)
 
     Returns:
         Updated list of tour segments
     """
     if tours and tours[-1][-1][1] != full_tour[0][1]:
         final_shortcut = add_return_path(
-            blocked_edges, tours[-1][-1], full_tour[0], full_tour
+            blocked_edges, tours[-1][-1], full_tour[0], full_tour, tour_nodes
         )
         if final_shortcut:
             tours.append(final_shortcut)
@@ -194,10 +258,11 @@ def construct_final_path(
 
 
 def shortcut(
-    blocked_edges: set[Edge],
+    blocked_edges: BlockedEdgeIndex,
     to_visit: list[tuple[int, Node]],
     tour: list[tuple[int, Node]],
     direction: int,
+    tour_nodes: np.ndarray | None = None,
 ) -> list[tuple[int, Node]]:
     """Find a path through nodes in to_visit that avoids blocked edges.
 
@@ -206,37 +271,48 @@ def shortcut(
 
     Args:
         graph: Graph with weighted edges
-        blocked_edges: Set of edges that cannot be traversed
+        blocked_edges: Index of edges that cannot be traversed
         to_visit: List of nodes to visit with their indices
         tour: Complete initial tour with indices
         direction: Direction of traversal (1: forward, -1: backward)
+        tour_nodes: Nodes of the tour as an array, enabling the vectorized
+            detour search on dense blocked edges (optional)
 
     Returns:
         List of visited nodes with their indices
     """
     current_tour = []
 
-    current_index, current_node = to_visit.pop(0)
-    current_tour.append(get_node_tour(current_index, tour))
-
-    while to_visit:
-        next_index, next_node = to_visit.pop(0)
+    # Walk to_visit with a cursor rather than popping from its front
+    frontier = iter(to_visit)
+    current_index, current_node = next(frontier)
+    current_tour.append(tour[current_index])
 
-        if edge(current_node, next_node) in blocked_edges:
+    for next_index, next_node in frontier:
+        if blocked_edges.is_blocked(current_node, next_node):
             # Edge is blocked, find alternative path
-            alternate_path = find_alternate_path(
-                blocked_edges,
-                (current_index, current_node),
-                (next_index, next_node),
-                tour,
-                direction,
-            )
+            if tour_nodes is None:
+                alternate_path = find_alternate_path(
+                    blocked_edges,
+                    (current_index, current_node),
+                    (next_index, next_node),
+                    tour,
+                    direction,
+                )
+            else:
+                alternate_path = find_dense_alternate_path(
+                    blocked_edges,
+                    (current_index, current_node),
+                    (next_index, next_node),
+                    tour_nodes,
+                    direction,
+                )
 
             if alternate_path:
                 # Add intermediate nodes from alternate path
                 for idx, _ in alternate_path[1:-1]:
-                    current_tour.append(get_node_tour(idx, tour))
-                current_tour.append(get_node_tour(next_index, tour))
+                    current_tour.append(tour[idx])
+                current_tour.append(tour[next_index])
                 current_index = next_index
                 current_node = next_node
             else:
@@ -244,7 +320,7 @@ def shortcut(
                 continue
         else:
             # Direct edge available, add next node to tour
-            current_tour.append(get_node_tour(next_index, tour))
+            current_tour.append(tour[next_index])
             current_index = next_index
             current_node = next_node
 
@@ -252,7 +328,7 @@ def shortcut(
 
 
 def find_alternate_path(
-    blocked_edges: set[Edge],
+    blocked_edges: BlockedEdgeIndex,
     start_pair: tuple[int, Node],
     end_pair: tuple[int, Node],
     tour: list[tuple[int, Node]],
@@ -261,10 +337,12 @@ def find_alternate_path(
     """Find an alternate path between two nodes when direct edge is blocked.
 
     Searches for a valid two-edge path through another node in the tour
-    that avoids blocked edges.
+    that avoids blocked edges. The candidates are read in place by walking the
+    tour positions from the start node to the end node, without copying the
+    tour.
 
     Args:
-        blocked_edges: Set of edges that cannot be traversed
+        blocked_edges: Index of edges that cannot be traversed
         start_pair: (index, node) of starting node in tour
         end_pair: (index, node) of ending node in tour
         tour: Complete initial tour with indices
@@ -276,49 +354,29 @@ def find_alternate_path(
     start_index, start_node = start_pair
     end_index, end_node = end_pair
 
-    # Reorder tour nodes based on direction and starting position
-    cycle = tour.copy()[::direction]
-    passed = False
-    lower = []
-    higher = []
+    # Walk the positions strictly between the start and end nodes in the
+    # direction of traversal, wrapping around the tour
+    position = start_index
+    for _ in range((end_index - start_index) * direction % len(tour) - 1):
+        position = (position + direction) % len(tour)
+        _, v = tour[position]
 
-    # Split the tour into nodes before and after the start node
-    for i, u in cycle:
-        if passed:
-            higher.append((i, u))
-        else:
-            lower.append((i, u))
+        # Skip candidates that cannot be reached from the start node
+        if blocked_edges.is_blocked(start_node, v):
+            continue
 
-        if i == start_index:
-            passed = True
-
-    # Reconstruct cycle with start node's position considered
-    cycle = higher + lower
-
-    # Extract nodes up to end node
-    final_cycle = []
-    for i, u in cycle:
-        if i == end_index:
-            break
-        final_cycle.append((i, u))
-    cycle = final_cycle.copy()
-
-    # Try to find a node that can form a valid path
-    for i, v in cycle:
-        if (
-            edge(start_node, v) not in blocked_edges
-            and edge(v, end_node) not in blocked_edges
-        ):
-            return [(start_index, start_node), (i, v), (end_index, end_node)]
+        if not blocked_edges.is_blocked(v, end_node):
+            return [(start_index, start_node), (position, v), end_pair]
 
     return []
 
 
 def add_return_path(
-    blocked_edges: set[Edge],
+    blocked_edges: BlockedEdgeIndex,
     start_pair: tuple[int, Node],
     end_pair: tuple[int, Node],
     tour: list[tuple[int, Node]],
+    tour_nodes: np.ndarray | None = None,
 ) -> list[tuple[int, Node]]:
     """Create a path from the last node back to the starting node.
 
@@ -326,50 +384,90 @@ def add_return_path(
 
     Args:
         graph: Graph with weighted edges
-        blocked_edges: Set of edges that cannot be traversed
+        blocked_edges: Index of edges that cannot be traversed
         start_pair: (index, node) of last node in current tour
         end_pair: (index, node) of first node in original tour
         tour: Complete initial tour with indices
+        tour_nodes: Nodes of the tour as an array, enabling the vectorized
+            detour search on dense blocked edges (optional)
 
     Returns:
         List of nodes forming return path, or empty list if none found
     """
-    start_idx, start_node = start_pair
-    end_idx, end_node = end_pair
+    _, start_node = start_pair
+    _, end_node = end_pair
 
     # Check if direct edge is available
-    if edge(start_node, end_node) not in blocked_edges:
+    if not blocked_edges.is_blocked(start_node, end_node):
         return [start_pair, end_pair]
 
-    # Try to find an alternate path in forward direction
-    path = find_alternate_path(
-        blocked_edges, (start_idx, start_node), (end_idx, end_node), tour, 1
-    )
+    # Try to find an alternate path in forward direction, then in reverse
+    for direction in (1, -1):
+        if tour_nodes is None:
+            path = find_alternate_path(
+                blocked_edges, start_pair, end_pair, tour, direction
+            )
+        else:
+            path = find_dense_alternate_path(
+                blocked_edges, start_pair, end_pair, tour_nodes, direction
+            )
 
-    # If no path found, try reverse direction
-    if not path:
-        path = find_alternate_path(
-            blocked_edges,
-            (start_idx, start_node),
-            (end_idx, end_node),
-            tour,
-            -1,
-        )
+        if path:
+            return path
+
+    return []
 
-    return path
 
+def find_dense_alternate_path(
+    blocked_edges: BlockedEdgeIndex,
+    start_pair: tuple[int, Node],
+    end_pair: tuple[int, Node],
+    tour_nodes: np.ndarray,
+    direction: int,
+) -> list[tuple[int, Node]]:
+    """Find an alternate path between two nodes on dense blocked edges.
 
-def get_node_tour(i: int, tour: list[tuple[int, Node]]) -> tuple[int, Node]:
-    """Find the node with given index in the tour.
+    Vectorized counterpart of find_alternate_path: a node v is a valid detour
+    when neither (start, v) nor (v, end) is blocked, which is a single OR of
+    two rows of the blocked matrix gathered in tour order followed by an
+    argmax. Positions are examined in chunks of doubling size so that a detour
+    found close to the start node stays cheap while long searches remain
+    vectorized.
 
     Args:
-        i: Index to search for
-        tour: Complete tour with indices
+        blocked_edges: Dense index of edges that cannot be traversed
+        start_pair: (index, node) of starting node in tour
+        end_pair: (index, node) of ending node in tour
+        tour_nodes: Nodes of the tour, indexed by position
+        direction: Direction of traversal
 
     Returns:
-        Tuple (index, node) from the tour, or None if not found
+        List of nodes forming alternate path, or empty list if none found
     """
-    for j, v in tour:
-        if i == j:
-            return (i, v)
-    return None
+    start_index, start_node = start_pair
+    end_index, end_node = end_pair
+
+    blocked_matrix = blocked_edges.as_matrix()
+    blocked_from_start = blocked_matrix[start_node]
+    blocked_to_end = blocked_matrix[end_node]
+
+    n = len(tour_nodes)
+    candidates_count = (end_index - start_index) * direction % n - 1
+    step = 1
+    chunk_size = DETOUR_CHUNK_SIZE
+    while step <= candidates_count:
+        steps = np.arange(step, min(step + chunk_size, candidates_count + 1))
+        positions = (start_index + direction * steps) % n
+        candidates = tour_nodes[positions]
+        allowed = ~(blocked_from_start[candidates] | blocked_to_end[candidates])
+        if allowed.any():
+            i = allowed.argmax()
+            return [
+                start_pair,
+                (int(positions[i]), int(candidates[i])),
+                end_pair,
+            ]
+        step += chunk_size
+        chunk_size *= 2
+
+    return []
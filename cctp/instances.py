@@ -0,0 +1,424 @@
+"""Array-backed graph instances for TSP algorithm implementations.
+
+This module provides instance types that store complete weighted graphs as
+NumPy arrays instead of networkx dictionaries, together with the adapters that
+convert between the representations. All solvers accept any of these forms.
+"""
+
+import itertools
+import math
+from collections.abc import Hashable, Iterable, Iterator, Sequence
+
+import networkx as nx
+import numpy as np
+from scipy.spatial import distance
+
+from .types import Edge, Node, Path, Weight
+
+
+class DistanceMatrix:
+    """Complete weighted graph stored as a dense distance matrix.
+
+    Nodes are the integers 0 to n - 1 and the weight of edge (u, v) is the
+    entry weights[u, v] of a contiguous symmetric n x n array. Missing edges
+    are represented by an infinite weight.
+
+    Attributes:
+        weights: Symmetric (n, n) array of edge weights with a zero diagonal
+        points: Optional (n, 2) array of coordinates whose Euclidean distances
+            are the edge weights
+    """
+
+    def __init__(
+        self, weights: np.ndarray, points: np.ndarray | None = None
+    ) -> None:
+        """Wrap an existing distance matrix.
+
+        Args:
+            weights: Square array of edge weights
+            points: Optional coordinates the weights were computed from
+
+        Raises:
+            ValueError: If the weights are not a square matrix, or the points
+                do not match its size or are not the origin of its weights
+        """
+        weights = np.ascontiguousarray(weights, dtype=np.float64)
+        if weights.shape != (len(weights), len(weights)):
+            msg = f"weights must be a square matrix, got {weights.shape}"
+            raise ValueError(msg)
+
+        if points is not None:
+            points = np.ascontiguousarray(points, dtype=np.float64)
+            if points.shape != (weights.shape[0], 2):
+                msg = f"points must have shape ({weights.shape[0]}, 2)"
+                raise ValueError(msg)
+
+            # the points stand for the weights in the cache fingerprint and
+            # select the Delaunay spanning tree, so they must match exactly
+            if not np.array_equal(weights, euclidean_distances(points)):
+                msg = "weights must be the Euclidean distances of the points"
+                raise ValueError(msg)
+
+        self.weights = weights
+        self.points = points
+
+    @classmethod
+    def from_points(
+        cls, coordinate_points: Sequence[tuple[float, float]] | np.ndarray
+    ) -> "DistanceMatrix":
+        """Create the Euclidean distance matrix of a set of 2D points.
+
+        Args:
+            coordinate_points: List of (x, y) coordinates or (n, 2) array
+
+        Returns:
+            Distance matrix whose weights are the pairwise Euclidean distances
+        """
+        points = np.asarray(coordinate_points, dtype=np.float64).reshape(-1, 2)
+        return cls._from_consistent_points(euclidean_distances(points), points)
+
+    @classmethod
+    def from_graph(cls, graph: nx.Graph) -> "DistanceMatrix":
+        """Convert a networkx graph into a distance matrix.
+
+        Nodes labelled 0 to n - 1 keep their label, and the nodes of other
+        graphs are numbered in their iteration order, as given by
+        node_labels. Edge weights are read from the 'weight' attribute and
+        absent edges get an infinite weight. Node coordinates stored in the
+        'pos' attribute are only carried over when the weights are exactly
+        their Euclidean distances, as for graphs built from coordinate points,
+        since they then replace the weights in the cache fingerprint of the
+        graph.
+
+        Args:
+            graph: Undirected weighted graph
+
+        Returns:
+            Distance matrix holding the weights of the graph
+        """
+        n = graph.number_of_nodes()
+        labels = node_labels(graph)
+        nodelist = range(n) if labels is None else labels
+
+        weights = nx.to_numpy_array(
+            graph, nodelist=nodelist, weight="weight", nonedge=np.inf
+        )
+        np.fill_diagonal(weights, 0.0)
+
+        positions = nx.get_node_attributes(graph, "pos")
+        if len(positions) == n:
+            points = np.array(
+                [positions[node] for node in nodelist], dtype=float
+            )
+            if points.shape == (n, 2) and np.array_equal(
+                weights, euclidean_distances(points)
+            ):
+                return cls._from_consistent_points(weights, points)
+
+        return cls(weights)
+
+    @classmethod
+    def _from_consistent_points(
+        cls, weights: np.ndarray, points: np.ndarray
+    ) -> "DistanceMatrix":
+        """Wrap a distance matrix already known to be computed from points.
+
+        Skips the comparison of the weights with the distances of the points,
+        which would compute them a second time.
+
+        Args:
+            weights: Square array of the Euclidean distances of the points
+            points: (n, 2) array of coordinates
+
+        Returns:
+            Distance matrix holding the weights and the points
+        """
+        distance_matrix = cls(weights)
+        distance_matrix.points = np.ascontiguousarray(points, dtype=np.float64)
+        return distance_matrix
+
+    def to_graph(self) -> nx.Graph:
+        """Convert the distance matrix into a networkx graph.
+
+        Returns:
+            Graph with one weighted edge per finite entry of the matrix and a
+            'pos' attribute on each node when coordinates are known
+        """
+        graph = nx.Graph()
+        graph.add_nodes_from(self.nodes())
+        if self.points is not None:
+            nx.set_node_attributes(
+                graph, dict(enumerate(map(tuple, self.points))), "pos"
+            )
+        graph.add_weighted_edges_from(
+            (u, v, self.weights[u, v]) for u, v in self.edges()
+        )
+        return graph
+
+    def __len__(self) -> int:
+        """Return the number of nodes."""
+        return self.weights.shape[0]
+
+    def nodes(self) -> range:
+        """Return the nodes of the graph."""
+        return range(len(self))
+
+    def edges(self) -> list[Edge]:
+        """Return the edges of the graph as ordered node pairs."""
+        rows, cols = np.triu_indices(len(self), k=1)
+        finite = np.isfinite(self.weights[rows, cols])
+        return list(
+            zip(rows[finite].tolist(), cols[finite].tolist(), strict=True)
+        )
+
+    def weight(self, u: Node, v: Node) -> Weight:
+        """Return the weight of edge (u, v)."""
+        return float(self.weights[u, v])
+
+    def rows(self, nodes: Sequence[Node]) -> np.ndarray:
+        """Return the weights of all edges incident to a subset of nodes.
+
+        Args:
+            nodes: Nodes whose rows are requested
+
+        Returns:
+            Array whose entry (i, v) is the weight between nodes[i] and v
+        """
+        return self.weights[np.asarray(nodes, dtype=np.intp)]
+
+    def submatrix(self, nodes: Sequence[Node]) -> np.ndarray:
+        """Return the distance matrix restricted to a subset of nodes.
+
+        Args:
+            nodes: Nodes to keep, in the order of the rows of the result
+
+        Returns:
+            Array whose entry (i, j) is the weight between nodes[i] and nodes[j]
+        """
+        indices = np.asarray(nodes, dtype=np.intp)
+        return self.weights[np.ix_(indices, indices)]
+
+    def path_weight(self, path: Path) -> Weight:
+        """Calculate the total weight of a path.
+
+        Args:
+            path: Sequence of nodes defining the path
+
+        Returns:
+            Total weight of all edges in the path
+        """
+        nodes = np.asarray(path, dtype=np.intp)
+        return float(self.weights[nodes[:-1], nodes[1:]].sum())
+
+
+class CoordinateGraph:
+    """Complete Euclidean graph defined implicitly by node coordinates.
+
+    Only the n coordinates are stored and the weight of edge (u, v) is computed
+    as the Euclidean distance between the two nodes whenever it is requested,
+    so memory grows linearly with the number of nodes.
+
+    Attributes:
+        points: (n, 2) array of node coordinates
+    """
+
+    def __init__(
+        self, coordinate_points: Sequence[tuple[float, float]] | np.ndarray
+    ) -> None:
+        """Create the implicit graph of a set of 2D points.
+
+        Args:
+            coordinate_points: List of (x, y) coordinates or (n, 2) array
+        """
+        self.points = np.ascontiguousarray(
+            coordinate_points, dtype=np.float64
+        ).reshape(-1, 2)
+        self._coordinates = list(map(tuple, self.points.tolist()))
+
+    def to_distance_matrix(self) -> DistanceMatrix:
+        """Materialize all edge weights into a distance matrix."""
+        return DistanceMatrix.from_points(self.points)
+
+    def to_graph(self) -> nx.Graph:
+        """Convert the implicit graph into a networkx graph."""
+        return self.to_distance_matrix().to_graph()
+
+    def __len__(self) -> int:
+        """Return the number of nodes."""
+        return self.points.shape[0]
+
+    def nodes(self) -> range:
+        """Return the nodes of the graph."""
+        return range(len(self))
+
+    def edges(self) -> Iterator[Edge]:
+        """Iterate over the edges of the graph as ordered node pairs."""
+        return itertools.combinations(self.nodes(), 2)
+
+    def weight(self, u: Node, v: Node) -> Weight:
+        """Return the weight of edge (u, v)."""
+        return math.dist(self._coordinates[u], self._coordinates[v])
+
+    def rows(self, nodes: Sequence[Node]) -> np.ndarray:
+        """Compute the weights of all edges incident to a subset of nodes.
+
+        Args:
+            nodes: Nodes whose rows are requested
+
+        Returns:
+            Array whose entry (i, v) is the weight between nodes[i] and v
+        """
+        subset_points = self.points[np.asarray(nodes, dtype=np.intp)]
+        return distance.cdist(subset_points, self.points)
+
+    def submatrix(self, nodes: Sequence[Node]) -> np.ndarray:
+        """Compute the distance matrix restricted to a subset of nodes.
+
+        Args:
+            nodes: Nodes to keep, in the order of the rows of the result
+
+        Returns:
+            Array whose entry (i, j) is the weight between nodes[i] and nodes[j]
+        """
+        subset_points = self.points[np.asarray(nodes, dtype=np.intp)]
+        return distance.cdist(subset_points, subset_points)
+
+    def path_weight(self, path: Path) -> Weight:
+        """Calculate the total weight of a path.
+
+        Args:
+            path: Sequence of nodes defining the path
+
+        Returns:
+            Total weight of all edges in the path
+        """
+        path_points = self.points[np.asarray(path, dtype=np.intp)]
+        steps = np.diff(path_points, axis=0)
+        return float(np.hypot(steps[:, 0], steps[:, 1]).sum())
+
+
+def euclidean_distances(points: np.ndarray) -> np.ndarray:
+    """Compute the matrix of pairwise Euclidean distances of 2D points.
+
+    Args:
+        points: (n, 2) array of coordinates
+
+    Returns:
+        (n, n) array of the distances between every pair of points
+    """
+    return distance.squareform(distance.pdist(points))
+
+
+# ArrayGraph is any array-backed graph representation
+ArrayGraph = DistanceMatrix | CoordinateGraph
+
+# GraphLike is any graph representation accepted by the solvers
+GraphLike = nx.Graph | ArrayGraph
+
+
+def as_array_graph(graph: GraphLike) -> ArrayGraph:
+    """Return an array-backed representation of a graph.
+
+    Args:
+        graph: Networkx graph or array-backed graph
+
+    Returns:
+        The graph itself if it already is array-backed, its conversion to a
+        distance matrix otherwise
+    """
+    if isinstance(graph, nx.Graph):
+        return DistanceMatrix.from_graph(graph)
+    return graph
+
+
+def as_distance_matrix(graph: GraphLike) -> DistanceMatrix:
+    """Return the distance matrix representation of a graph.
+
+    Args:
+        graph: Networkx graph or array-backed graph
+
+    Returns:
+        The graph itself if it already is a distance matrix, its conversion
+        otherwise
+    """
+    if isinstance(graph, DistanceMatrix):
+        return graph
+    if isinstance(graph, CoordinateGraph):
+        return graph.to_distance_matrix()
+    return DistanceMatrix.from_graph(graph)
+
+
+def node_labels(graph: GraphLike) -> list[Hashable] | None:
+    """Return the labels of the nodes of a graph not numbered 0 to n - 1.
+
+    Array-backed representations number the nodes from 0 to n - 1. Networkx
+    graphs whose nodes are these integers keep their labels, while the nodes
+    of other networkx graphs are numbered in their iteration order.
+
+    Args:
+        graph: Networkx graph or array-backed graph
+
+    Returns:
+        List whose entry i is the label of node i, or None when the nodes are
+        already the integers 0 to n - 1
+    """
+    if not isinstance(graph, nx.Graph):
+        return None
+
+    labels = list(graph.nodes())
+    if set(labels) == set(range(len(labels))):
+        return None
+    return labels
+
+
+def label_nodes(
+    nodes: Sequence[Node], labels: list[Hashable] | None
+) -> list[Hashable]:
+    """Replace node numbers by the labels of the nodes.
+
+    Args:
+        nodes: Sequence of nodes numbered 0 to n - 1, such as a tour
+        labels: Labels of the nodes returned by node_labels
+
+    Returns:
+        List of the labels of the nodes
+    """
+    if labels is None:
+        return list(nodes)
+    return [labels[node] for node in nodes]
+
+
+def index_nodes(
+    nodes: Sequence[Hashable], labels: list[Hashable] | None
+) -> list[Node]:
+    """Replace node labels by the numbers of the nodes.
+
+    Args:
+        nodes: Sequence of node labels, such as a tour
+        labels: Labels of the nodes returned by node_labels
+
+    Returns:
+        List of the nodes numbered 0 to n - 1
+    """
+    if labels is None:
+        return list(nodes)
+    numbers = {label: number for number, label in enumerate(labels)}
+    return [numbers[node] for node in nodes]
+
+
+def index_edges(
+    edges: Iterable[tuple[Hashable, Hashable]], labels: list[Hashable] | None
+) -> list[Edge]:
+    """Replace the node labels of edges by the numbers of the nodes.
+
+    Args:
+        edges: Edges given as pairs of node labels
+        labels: Labels of the nodes returned by node_labels
+
+    Returns:
+        List of the edges as pairs of nodes numbered 0 to n - 1
+    """
+    if labels is None:
+        return list(edges)
+    numbers = {label: number for number, label in enumerate(labels)}
+    return [(numbers[u], numbers[v]) for u, v in edges]
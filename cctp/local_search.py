@@ -0,0 +1,359 @@
+"""Local search improving TSP tours with 2-opt and Or-opt moves.
+
+This module implements tour improvement restricted to candidate edges: only
+moves adding an edge between a node and one of its nearest neighbours are
+examined, so that a pass over the tour takes time linear in the number of
+nodes instead of quadratic. The tour is kept in an array along with the
+position of every node, segments are reversed or shifted on the shorter side
+of the tour, and don't-look bits skip the nodes whose surroundings did not
+change since they were last examined.
+"""
+
+import time
+from collections import deque
+from collections.abc import Sequence
+
+import numpy as np
+from scipy import spatial
+
+from .instances import (
+    ArrayGraph,
+    GraphLike,
+    as_array_graph,
+    index_nodes,
+    label_nodes,
+    node_labels,
+)
+from .types import Node, Path, Weight
+
+# Number of nearest neighbours of every node examined by the moves
+NEIGHBOR_CANDIDATES = 10
+
+# Longest segment moved by Or-opt
+OR_OPT_SEGMENT = 3
+
+# Smallest gain of an applied move, below which moves are considered neutral
+GAIN_TOLERANCE = 1e-10
+
+# Number of examined nodes between two checks of the time budget
+TIME_CHECK_INTERVAL = 64
+
+# Number of rows of weights read at once when searching neighbours
+NEIGHBOR_CHUNK = 1024
+
+
+def improve_tour(
+    graph: GraphLike,
+    tour: Sequence[Node],
+    time_limit: float | None = None,
+    candidates: int = NEIGHBOR_CANDIDATES,
+) -> tuple[Path, Weight]:
+    """Improve a tour with 2-opt and Or-opt moves on candidate edges.
+
+    Moves are applied as soon as they shorten the tour, until no node can be
+    improved or the time budget is spent.
+
+    Args:
+        graph: Complete graph with weighted edges, or array-backed graph
+        tour: Closed tour, whose first and last nodes are identical
+        time_limit: Time budget in seconds, unlimited when None
+        candidates: Number of nearest neighbours of every node examined
+
+    Returns:
+        Tuple containing the improved closed tour, which starts and ends at
+        the first node of the given tour, and its total weight
+    """
+    labels = node_labels(graph)
+    graph = as_array_graph(graph)
+    tour = index_nodes(tour, labels)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+    # every tour of three nodes or less has the same cycle
+    if len(tour) <= OR_OPT_SEGMENT + 1:
+        return label_nodes(tour, labels), graph.path_weight(tour)
+
+    search = TourImprovement(graph, tour[:-1], candidates)
+    search.run(deadline)
+
+    improved_tour = search.closed_tour(tour[0])
+    return (
+        label_nodes(improved_tour, labels),
+        graph.path_weight(improved_tour),
+    )
+
+
+def candidate_neighbors(graph: ArrayGraph, k: int) -> np.ndarray:
+    """Find the nearest neighbours of every node of a graph.
+
+    Coordinate graphs are searched with a k-d tree. Other graphs read their
+    weights by chunks of rows, so that the full matrix is never copied.
+
+    Args:
+        graph: Array-backed graph
+        k: Number of neighbours per node, at most n - 1
+
+    Returns:
+        (n, k) array whose row v lists the neighbours of v by increasing
+        weight
+    """
+    n = len(graph)
+    nodes = np.arange(n)
+
+    if graph.points is not None:
+        _, neighbors = spatial.cKDTree(graph.points).query(graph.points, k + 1)
+        neighbors = np.reshape(neighbors, (n, k + 1))
+
+        # coincident points may list a node after one of its duplicates, so
+        # the node itself is moved to the end of its row instead of dropped
+        is_self = neighbors == nodes[:, None]
+        order = np.argsort(is_self, axis=1, kind="stable")
+        return np.take_along_axis(neighbors, order, axis=1)[:, :k]
+
+    neighbors = np.empty((n, k), dtype=np.intp)
+    for start in range(0, n, NEIGHBOR_CHUNK):
+        chunk = nodes[start : start + NEIGHBOR_CHUNK]
+        chunk_weights = graph.rows(chunk)
+        chunk_weights[np.arange(len(chunk)), chunk] = np.inf
+
+        nearest = np.argpartition(chunk_weights, k - 1, axis=1)[:, :k]
+        nearest_weights = np.take_along_axis(chunk_weights, nearest, axis=1)
+        order = np.argsort(nearest_weights, axis=1, kind="stable")
+        neighbors[chunk] = np.take_along_axis(nearest, order, axis=1)
+    return neighbors
+
+
+class TourImprovement:
+    """State of the local search on a tour.
+
+    The tour is an array of nodes, read cyclically, and the position of every
+    node in it is kept up to date, so that the successor and predecessor of a
+    node are found in constant time. Nodes whose don't-look bit is cleared are
+    kept in a queue and examined in turn.
+
+    Attributes:
+        n: Number of nodes
+        tour: Open tour as an array of nodes
+        position: Position of every node in the tour
+        neighbors: Candidate neighbours of every node, by increasing weight
+    """
+
+    def __init__(
+        self, graph: ArrayGraph, tour: Sequence[Node], candidates: int
+    ) -> None:
+        """Prepare the improvement of a tour.
+
+        Args:
+            graph: Array-backed graph
+            tour: Open tour visiting every node once
+            candidates: Number of nearest neighbours of every node examined
+        """
+        self.n = len(tour)
+        self.weight = graph.weight
+        self.tour = np.array(tour, dtype=np.intp)
+        self.position = np.empty(self.n, dtype=np.intp)
+        self.position[self.tour] = np.arange(self.n)
+
+        k = min(candidates, self.n - 1)
+        self.neighbors = candidate_neighbors(graph, k).tolist() if k > 0 else []
+
+        self.queue = deque(self.tour.tolist())
+        self.queued = np.ones(self.n, dtype=np.bool_)
+
+    def run(self, deadline: float | None) -> None:
+        """Apply improving moves until a local optimum or the deadline.
+
+        Args:
+            deadline: Value of time.perf_counter at which to stop, or None
+        """
+        examined = 0
+        while self.queue:
+            examined += 1
+            if (
+                deadline is not None
+                and examined % TIME_CHECK_INTERVAL == 0
+                and time.perf_counter() > deadline
+            ):
+                return
+
+            # the nodes touched by an applied move are queued again
+            node = self.queue.popleft()
+            self.queued[node] = False
+            if not self.two_opt(node):
+                self.or_opt(node)
+
+    def closed_tour(self, start: Node) -> Path:
+        """Return the tour as a closed path starting at a given node."""
+        tour = np.roll(self.tour, -int(self.position[start])).tolist()
+        tour.append(start)
+        return tour
+
+    def succ(self, node: Node) -> Node:
+        """Return the node following a node in the tour."""
+        return int(self.tour[(self.position[node] + 1) % self.n])
+
+    def pred(self, node: Node) -> Node:
+        """Return the node preceding a node in the tour."""
+        return int(self.tour[self.position[node] - 1])
+
+    def wake(self, *nodes: Node) -> None:
+        """Clear the don't-look bits of nodes whose surroundings changed."""
+        for node in nodes:
+            if not self.queued[node]:
+                self.queued[node] = True
+                self.queue.append(node)
+
+    def two_opt(self, a: Node) -> bool:
+        """Apply the first improving 2-opt move adding an edge at a node.
+
+        The move replaces the edges (a, b) and (c, d) with (a, c) and (b, d),
+        where b follows a and d follows c, or b precedes a and d precedes c.
+        Since neighbours are sorted, the search stops at the first neighbour
+        c that is not closer to a than b is.
+
+        Args:
+            a: Node at which the new edge is added
+
+        Returns:
+            True if a move was applied
+        """
+        weight = self.weight
+        for forward in (True, False):
+            b = self.succ(a) if forward else self.pred(a)
+            removed_weight = weight(a, b)
+
+            for c in self.neighbors[a]:
+                partial_gain = removed_weight - weight(a, c)
+                if partial_gain <= GAIN_TOLERANCE:
+                    break
+
+                d = self.succ(c) if forward else self.pred(c)
+                if c == b or d == a:
+                    continue
+
+                gain = partial_gain + weight(c, d) - weight(b, d)
+                if gain > GAIN_TOLERANCE:
+                    if forward:
+                        self.reverse(self.position[b], self.position[c])
+                    else:
+                        self.reverse(self.position[c], self.position[b])
+                    self.wake(a, b, c, d)
+                    return True
+
+        return False
+
+    def or_opt(self, first: Node) -> bool:
+        """Apply the first improving Or-opt move of a segment at a node.
+
+        Segments of one to three nodes starting at the node are moved, in
+        either orientation, between two adjacent nodes one of which is a
+        candidate neighbour of an end of the segment.
+
+        Args:
+            first: First node of the moved segments
+
+        Returns:
+            True if a move was applied
+        """
+        weight = self.weight
+        start = int(self.position[first])
+        before = self.pred(first)
+
+        for length in range(1, min(OR_OPT_SEGMENT, self.n - 3) + 1):
+            segment = self.tour[
+                np.arange(start, start + length) % self.n
+            ].tolist()
+            last = segment[-1]
+            after = self.succ(last)
+            removal_gain = (
+                weight(before, first)
+                + weight(last, after)
+                - weight(before, after)
+            )
+            if removal_gain <= GAIN_TOLERANCE:
+                continue
+
+            for end in (first, last):
+                for c in self.neighbors[end]:
+                    if weight(end, c) >= removal_gain:
+                        break
+                    if c in segment:
+                        continue
+
+                    for x, y in ((c, self.succ(c)), (self.pred(c), c)):
+                        if x in segment or y in segment:
+                            continue
+
+                        forward_weight = weight(x, first) + weight(last, y)
+                        reversed_weight = weight(x, last) + weight(first, y)
+                        gain = (
+                            removal_gain
+                            + weight(x, y)
+                            - min(forward_weight, reversed_weight)
+                        )
+                        if gain > GAIN_TOLERANCE:
+                            self.move_segment(
+                                start,
+                                length,
+                                x,
+                                reversed_weight < forward_weight,
+                            )
+                            self.wake(before, after, x, y, *segment)
+                            return True
+
+        return False
+
+    def reverse(self, i: int, j: int) -> None:
+        """Reverse the part of the tour from position i to position j.
+
+        When the part is longer than half the tour, the rest of the tour is
+        reversed instead, which gives the same cycle in the other direction.
+
+        Args:
+            i: Position of the first node of the part
+            j: Position of the last node of the part, following i cyclically
+        """
+        length = (j - i) % self.n + 1
+        if 2 * length > self.n:
+            i, j = (j + 1) % self.n, (i - 1) % self.n
+            length = self.n - length
+
+        indices = np.arange(i, i + length) % self.n
+        self.tour[indices] = self.tour[indices[::-1]]
+        self.position[self.tour[indices]] = indices
+
+    def move_segment(
+        self, start: int, length: int, x: Node, reverse: bool
+    ) -> None:
+        """Move a segment of the tour between a node and its successor.
+
+        The nodes between the segment and its new place are shifted to make
+        room for it, on the side of the tour where they are fewest.
+
+        Args:
+            start: Position of the first node of the segment
+            length: Number of nodes of the segment
+            x: Node after which the segment is inserted, outside of it
+            reverse: Whether to insert the segment in reverse order
+        """
+        segment = self.tour[np.arange(start, start + length) % self.n]
+        if reverse:
+            segment = segment[::-1]
+
+        # nodes from the end of the segment up to x, or from the successor of
+        # x up to the start of the segment
+        x_position = int(self.position[x])
+        forward_length = (x_position - start - length) % self.n + 1
+        backward_length = self.n - length - forward_length
+
+        if forward_length <= backward_length:
+            indices = np.arange(start, start + length + forward_length)
+            shifted = self.tour[indices[length:] % self.n]
+            window = np.concatenate((shifted, segment))
+        else:
+            indices = np.arange(start - backward_length, start + length)
+            shifted = self.tour[indices[:backward_length] % self.n]
+            window = np.concatenate((segment, shifted))
+
+        indices %= self.n
+        self.tour[indices] = window
+        self.position[window] = indices
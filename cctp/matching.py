@@ -0,0 +1,854 @@
+"""Perfect matchings for the Christofides algorithm.
+
+This module implements Edmonds' blossom algorithm for minimum weight perfect
+matchings on a dense distance matrix. It follows the primal-dual method of the
+networkx implementation, itself based on the work of Van Rantwijk and Galil,
+but keeps its state in integer-indexed arrays. The neighbours of a vertex are
+scanned with vectorized slack computations, and the search starts from a
+greedy matching on the edges that are unambiguously tight.
+
+Faster greedy heuristics are provided as well, which give up the optimality of
+the matching and with it the 1.5 approximation guarantee of Christofides.
+"""
+
+import numpy as np
+
+from .types import Edge
+
+# Labels of top-level blossoms and vertices during a stage
+FREE = 0
+S_LABEL = 1
+T_LABEL = 2
+
+# Flag set on the label of S-blossoms visited while tracing back alternating
+# paths
+BREADCRUMB = 4
+
+# Relative tolerance on the gains of matching exchanges
+GAIN_TOLERANCE = 1e-9
+
+# Number of nearest neighbours searched by the greedy matching heuristics
+GREEDY_CANDIDATES = 10
+
+# Matching strategies available to Christofides
+MATCHING_STRATEGIES = ("exact", "greedy", "greedy_2opt")
+
+
+class BlossomMatching:
+    """State of the blossom algorithm on a weighted graph.
+
+    Vertices are the integers 0 to n - 1 and non-trivial blossoms the integers
+    n to 2n - 1. The minimum weight perfect matching is found as a maximum
+    weight maximum cardinality matching for the gains (c + 1) - w, where c is
+    the largest edge weight. Dual variables and slacks are multiplied by two,
+    as in the networkx implementation.
+
+    Attributes:
+        n: Number of vertices
+        gains: (n, n) array of gains, minus infinity for missing edges
+        mate: Matched vertex of every vertex, -1 for single vertices
+        dual: Dual variable of every vertex
+        blossom_dual: Dual variable of every blossom
+    """
+
+    def __init__(self, weights: np.ndarray) -> None:
+        """Prepare the matching of a weighted graph.
+
+        Args:
+            weights: Symmetric (n, n) array of edge weights, infinite for
+                missing edges
+        """
+        n = len(weights)
+        weights = np.asarray(weights, dtype=np.float64)
+        finite = np.isfinite(weights)
+        max_weight = weights[finite].max() if finite.any() else 0.0
+
+        self.n = n
+        self.gains = np.where(finite, (max_weight + 1.0) - weights, -np.inf)
+        np.fill_diagonal(self.gains, -np.inf)
+        self.vertices = np.arange(n)
+
+        self.mate = np.full(n, -1)
+        self.dual = np.zeros(n)
+        self.blossom_dual = np.zeros(2 * n)
+
+        self.label = np.zeros(2 * n, dtype=np.int8)
+        self.label_edge: list[Edge | None] = [None] * (2 * n)
+        self.in_blossom = np.arange(n)
+        self.blossom_parent = np.full(2 * n, -1)
+        self.blossom_base = list(range(n)) + [-1] * n
+        self.blossom_children: list[list[int] | None] = [None] * (2 * n)
+        self.blossom_edges: list[list[Edge] | None] = [None] * (2 * n)
+        self.active_blossoms = np.zeros(2 * n, dtype=np.bool_)
+        self.unused_blossoms = list(range(2 * n - 1, n - 1, -1))
+
+        # least-slack edge of every vertex or top-level S-blossom, and least
+        # slack edges of top-level S-blossoms to every other S-blossom
+        self.best_from = np.full(2 * n, -1)
+        self.best_to = np.full(2 * n, -1)
+        self.best_edges: list[tuple[np.ndarray, np.ndarray] | None] = [None] * (
+            2 * n
+        )
+
+        self.allowed = np.zeros((n, n), dtype=np.bool_)
+        self.queue: list[int] = []
+
+    def solve(self) -> list[Edge]:
+        """Run the blossom algorithm until the matching is optimal.
+
+        Returns:
+            Matched pairs of vertices as ordered pairs
+        """
+        self.initialize()
+
+        while True:
+            # each stage looks for an augmenting path from the single vertices
+            self.label[:] = FREE
+            self.label_edge = [None] * (2 * self.n)
+            self.best_from[:] = -1
+            self.best_edges = [None] * (2 * self.n)
+            self.allowed[:] = False
+            self.queue = []
+
+            for v in range(self.n):
+                if self.mate[v] == -1 and self.label[self.in_blossom[v]] == 0:
+                    self.assign_label(v, S_LABEL, -1)
+
+            augmented = False
+            while True:
+                while self.queue and not augmented:
+                    augmented = self.scan(self.queue.pop())
+
+                if augmented or not self.update_duals():
+                    break
+
+            if not augmented:
+                break
+
+            # expand the S-blossoms whose dual variable dropped to zero
+            for b in range(self.n, 2 * self.n):
+                if (
+                    self.active_blossoms[b]
+                    and self.blossom_parent[b] == -1
+                    and self.label[b] == S_LABEL
+                    and self.blossom_dual[b] == 0
+                ):
+                    self.expand_blossom(b, endstage=True)
+
+        return [(v, int(w)) for v, w in enumerate(self.mate) if v < w]
+
+    def slack(self, v: int, w: int) -> float:
+        """Return twice the slack of edge (v, w) outside of blossoms."""
+        return self.dual[v] + self.dual[w] - 2 * self.gains[v, w]
+
+    def initialize(self) -> None:
+        """Find feasible dual variables and a greedy matching on tight edges.
+
+        Every vertex first gets the largest gain of its edges as dual
+        variable, which makes all slacks non-negative. Vertices are then
+        visited in order: a single vertex whose least-slack edge is unique
+        and leads to another single vertex has its dual lowered until the
+        edge becomes tight, and the edge is matched. Ties are left to the
+        blossom search, so that among several optimal matchings the one found
+        by networkx is usually kept.
+        """
+        self.dual[:] = np.max(self.gains, axis=1, initial=0.0)
+
+        for v in range(self.n):
+            if self.mate[v] != -1:
+                continue
+
+            slacks = self.dual[v] + self.dual - 2 * self.gains[v]
+            min_slack = slacks.min(initial=np.inf)
+            if not np.isfinite(min_slack):
+                continue
+
+            tight = np.flatnonzero(slacks == min_slack)
+            if len(tight) == 1 and self.mate[tight[0]] == -1:
+                w = int(tight[0])
+                self.dual[v] -= min_slack
+                self.mate[v] = w
+                self.mate[w] = v
+
+    def leaves(self, b: int) -> list[int]:
+        """Return the vertices contained in a blossom."""
+        if b < self.n:
+            return [b]
+
+        leaves = []
+        stack = [b]
+        while stack:
+            t = stack.pop()
+            if t < self.n:
+                leaves.append(t)
+            else:
+                stack.extend(self.blossom_children[t])
+        return leaves
+
+    def assign_label(self, w: int, t: int, v: int) -> None:
+        """Label the top-level blossom of w, reached through an edge from v.
+
+        Args:
+            w: Vertex whose top-level blossom is labelled
+            t: Label to assign, S or T
+            v: Vertex through which w is reached, -1 for single vertices
+        """
+        b = self.in_blossom[w]
+        self.label[w] = self.label[b] = t
+        label_edge = (v, w) if v != -1 else None
+        self.label_edge[w] = self.label_edge[b] = label_edge
+        self.best_from[w] = self.best_from[b] = -1
+
+        if t == S_LABEL:
+            # b became an S-blossom, its vertices are scanned later
+            self.queue.extend(self.leaves(b))
+        else:
+            # b became a T-blossom, its base is matched to a new S-vertex
+            base = self.blossom_base[b]
+            self.assign_label(int(self.mate[base]), S_LABEL, base)
+
+    def scan(self, v: int) -> bool:
+        """Scan the edges of an S-vertex.
+
+        Tight edges extend the alternating tree, create blossoms or augment the
+        matching. The other edges update the least-slack edges used by the
+        dual updates.
+
+        Args:
+            v: S-vertex to scan
+
+        Returns:
+            True if the matching was augmented
+        """
+        neighbors = self.vertices
+        slacks = self.dual[v] + self.dual - 2 * self.gains[v]
+        external = self.in_blossom[neighbors] != self.in_blossom[v]
+        allowed = (self.allowed[v, neighbors] | (slacks <= 0)) & external
+
+        tight = neighbors[allowed]
+        self.allowed[v, tight] = True
+        self.allowed[tight, v] = True
+
+        for w in tight.tolist():
+            bv = self.in_blossom[v]
+            bw = self.in_blossom[w]
+            if bv == bw:
+                continue
+
+            if self.label[bw] == FREE:
+                # w is a free vertex, label it T and its mate S
+                self.assign_label(w, T_LABEL, v)
+            elif self.label[bw] == S_LABEL:
+                # w is an S-vertex, we found either a blossom or an
+                # augmenting path
+                base = self.scan_blossom(v, w)
+                if base == -1:
+                    self.augment_matching(v, w)
+                    return True
+                self.add_blossom(base, v, w)
+            elif self.label[w] == FREE:
+                # w is inside a T-blossom and can now be reached from outside
+                self.label[w] = T_LABEL
+                self.label_edge[w] = (v, w)
+
+        # keep track of the least-slack edges, using the labels as they stand
+        # after the tight edges were handled
+        others = ~allowed & np.isfinite(slacks)
+        neighbors, slacks = neighbors[others], slacks[others]
+        bv = self.in_blossom[v]
+        blossoms = self.in_blossom[neighbors]
+        external = blossoms != bv
+        neighbors = neighbors[external]
+        slacks = slacks[external]
+        to_s = self.label[blossoms[external]] == S_LABEL
+
+        if to_s.any():
+            i = np.flatnonzero(to_s)[np.argmin(slacks[to_s])]
+            if self.best_from[bv] == -1 or slacks[i] < self.slack(
+                self.best_from[bv], self.best_to[bv]
+            ):
+                self.best_from[bv] = v
+                self.best_to[bv] = neighbors[i]
+
+        to_free = ~to_s & (self.label[neighbors] == FREE)
+        if to_free.any():
+            free_vertices = neighbors[to_free]
+            current = np.full(len(free_vertices), np.inf)
+            known = self.best_from[free_vertices] != -1
+            current[known] = (
+                self.dual[self.best_from[free_vertices[known]]]
+                + self.dual[free_vertices[known]]
+                - 2
+                * self.gains[
+                    self.best_from[free_vertices[known]], free_vertices[known]
+                ]
+            )
+            better = free_vertices[slacks[to_free] < current]
+            self.best_from[better] = v
+            self.best_to[better] = better
+
+        return False
+
+    def scan_blossom(self, v: int, w: int) -> int:
+        """Trace back from two S-vertices to find a blossom or a path.
+
+        Args:
+            v: First S-vertex
+            w: Second S-vertex, joined to v by a tight edge
+
+        Returns:
+            Base vertex of the new blossom, or -1 if an augmenting path was
+            found
+        """
+        path = []
+        base = -1
+        while v != -1:
+            b = self.in_blossom[v]
+            if self.label[b] & BREADCRUMB:
+                base = self.blossom_base[b]
+                break
+
+            path.append(b)
+            self.label[b] = S_LABEL | BREADCRUMB
+
+            if self.label_edge[b] is None:
+                # the base of b is single, stop tracing this path
+                v = -1
+            else:
+                # trace back through the T-blossom to the previous S-blossom
+                v = self.label_edge[b][0]
+                v = self.label_edge[self.in_blossom[v]][0]
+
+            # alternate between both paths
+            if w != -1:
+                v, w = w, v
+
+        for b in path:
+            self.label[b] = S_LABEL
+        return base
+
+    def add_blossom(self, base: int, v: int, w: int) -> None:
+        """Create a new S-blossom from the cycle through edge (v, w).
+
+        Args:
+            base: Base vertex of the new blossom
+            v: First S-vertex of the edge closing the cycle
+            w: Second S-vertex of the edge closing the cycle
+        """
+        bb = self.in_blossom[base]
+        bv = self.in_blossom[v]
+        bw = self.in_blossom[w]
+
+        b = self.unused_blossoms.pop()
+        self.active_blossoms[b] = True
+        self.blossom_base[b] = base
+        self.blossom_parent[b] = -1
+        self.blossom_parent[bb] = b
+
+        # list the sub-blossoms and their connecting edges around the cycle
+        children = []
+        edges = [(v, w)]
+        while bv != bb:
+            self.blossom_parent[bv] = b
+            children.append(bv)
+            edges.append(self.label_edge[bv])
+            v = self.label_edge[bv][0]
+            bv = self.in_blossom[v]
+        children.append(bb)
+        children.reverse()
+        edges.reverse()
+        while bw != bb:
+            self.blossom_parent[bw] = b
+            children.append(bw)
+            edges.append((self.label_edge[bw][1], self.label_edge[bw][0]))
+            w = self.label_edge[bw][0]
+            bw = self.in_blossom[w]
+
+        self.blossom_children[b] = children
+        self.blossom_edges[b] = edges
+        self.label[b] = S_LABEL
+        self.label_edge[b] = self.label_edge[bb]
+        self.blossom_dual[b] = 0.0
+
+        # T-vertices of the blossom become S-vertices
+        leaves = np.array(self.leaves(b))
+        t_leaves = leaves[self.label[self.in_blossom[leaves]] == T_LABEL]
+        self.queue.extend(t_leaves.tolist())
+        self.in_blossom[leaves] = b
+
+        self.update_best_edges(b)
+
+    def update_best_edges(self, b: int) -> None:
+        """Compute the least-slack edges from a new S-blossom.
+
+        The least-slack edges of the sub-blossoms are merged, or computed from
+        the edges of their vertices when unknown, to keep the least-slack edge
+        to every neighbouring S-blossom.
+
+        Args:
+            b: New top-level S-blossom
+        """
+        # gather the edges from the sub-blossoms to other S-blossoms
+        sources, targets = [], []
+        for child in self.blossom_children[b]:
+            if child >= self.n and self.best_edges[child] is not None:
+                child_sources, child_targets = self.best_edges[child]
+                self.best_edges[child] = None
+            else:
+                child_leaves = self.leaves(child)
+                child_sources = np.repeat(child_leaves, self.n)
+                child_targets = np.tile(self.vertices, len(child_leaves))
+            sources.append(child_sources)
+            targets.append(child_targets)
+            self.best_from[child] = -1
+
+        sources = np.concatenate(sources).astype(np.intp)
+        targets = np.concatenate(targets).astype(np.intp)
+        blossoms = self.in_blossom[targets]
+        to_s = (
+            (blossoms != b)
+            & (self.label[blossoms] == S_LABEL)
+            & np.isfinite(self.gains[sources, targets])
+        )
+        sources, targets, blossoms = (
+            sources[to_s],
+            targets[to_s],
+            blossoms[to_s],
+        )
+
+        # keep the least-slack edge to every neighbouring S-blossom
+        slacks = (
+            self.dual[sources]
+            + self.dual[targets]
+            - 2 * self.gains[sources, targets]
+        )
+        order = np.lexsort((slacks, blossoms))
+        first = np.ones(len(order), dtype=np.bool_)
+        first[1:] = blossoms[order[1:]] != blossoms[order[:-1]]
+        best = order[first]
+
+        self.best_edges[b] = (sources[best], targets[best])
+        if len(best) > 0:
+            i = best[np.argmin(slacks[best])]
+            self.best_from[b] = sources[i]
+            self.best_to[b] = targets[i]
+        else:
+            self.best_from[b] = -1
+
+    def expand_blossom(self, b: int, endstage: bool) -> None:
+        """Expand a top-level blossom into its sub-blossoms.
+
+        Args:
+            b: Blossom to expand
+            endstage: Whether the expansion happens at the end of a stage, in
+                which case sub-blossoms with a zero dual are expanded as well
+        """
+        to_expand = [b]
+        while to_expand:
+            blossom = to_expand.pop()
+            for child in self.blossom_children[blossom]:
+                self.blossom_parent[child] = -1
+                if (
+                    child >= self.n
+                    and endstage
+                    and self.blossom_dual[child] == 0
+                ):
+                    to_expand.append(child)
+                else:
+                    self.in_blossom[self.leaves(child)] = child
+
+            # an expanded T-blossom has its sub-blossoms relabelled
+            if not endstage and self.label[blossom] == T_LABEL:
+                self.relabel_expanded_blossom(blossom)
+
+            self.label[blossom] = FREE
+            self.label_edge[blossom] = None
+            self.best_from[blossom] = -1
+            self.best_edges[blossom] = None
+            self.blossom_parent[blossom] = -1
+            self.blossom_base[blossom] = -1
+            self.blossom_children[blossom] = None
+            self.blossom_edges[blossom] = None
+            self.blossom_dual[blossom] = 0.0
+            self.active_blossoms[blossom] = False
+            self.unused_blossoms.append(blossom)
+
+    def relabel_expanded_blossom(self, b: int) -> None:
+        """Relabel the sub-blossoms of a T-blossom expanded during a stage.
+
+        Args:
+            b: Expanded T-blossom, whose children are already top-level
+        """
+        children = self.blossom_children[b]
+        edges = self.blossom_edges[b]
+
+        # start at the sub-blossom through which the blossom got its label and
+        # go round the blossom to the base in the direction of even length
+        entry_child = self.in_blossom[self.label_edge[b][1]]
+        j = children.index(entry_child)
+        if j & 1:
+            j -= len(children)
+            step = 1
+        else:
+            step = -1
+
+        v, w = self.label_edge[b]
+        while j != 0:
+            # relabel the T-sub-blossom
+            if step == 1:
+                p, q = edges[j]
+            else:
+                q, p = edges[j - 1]
+            self.label[w] = FREE
+            self.label[q] = FREE
+            self.assign_label(w, T_LABEL, v)
+
+            # step to the next S-sub-blossom and note its forward edge
+            self.allowed[p, q] = self.allowed[q, p] = True
+            j += step
+            if step == 1:
+                v, w = edges[j]
+            else:
+                w, v = edges[j - 1]
+            self.allowed[v, w] = self.allowed[w, v] = True
+            j += step
+
+        # relabel the base T-sub-blossom without stepping through to its mate
+        bw = children[j]
+        self.label[w] = self.label[bw] = T_LABEL
+        self.label_edge[w] = self.label_edge[bw] = (v, w)
+        self.best_from[bw] = -1
+
+        # the remaining sub-blossoms are labelled T only when reachable
+        j += step
+        while children[j] != entry_child:
+            bv = children[j]
+            j += step
+            if self.label[bv] == S_LABEL:
+                continue
+
+            reached = [x for x in self.leaves(bv) if self.label[x] != FREE]
+            if reached:
+                v = reached[0]
+                self.label[v] = FREE
+                self.label[self.mate[self.blossom_base[bv]]] = FREE
+                self.assign_label(v, T_LABEL, self.label_edge[v][0])
+
+    def augment_blossom(self, b: int, v: int) -> None:
+        """Swap matched and unmatched edges on the path from v to the base of b.
+
+        Args:
+            b: Blossom to augment
+            v: Vertex of the blossom that becomes its new base
+        """
+        to_augment = [(b, v)]
+        while to_augment:
+            blossom, vertex = to_augment.pop()
+
+            # bubble up from the vertex to an immediate sub-blossom
+            t = vertex
+            while self.blossom_parent[t] != blossom:
+                t = self.blossom_parent[t]
+            if t >= self.n:
+                to_augment.append((t, vertex))
+
+            children = self.blossom_children[blossom]
+            edges = self.blossom_edges[blossom]
+            i = j = children.index(t)
+            if i & 1:
+                j -= len(children)
+                step = 1
+            else:
+                step = -1
+
+            # move along the blossom to the base, swapping the edges
+            while j != 0:
+                j += step
+                t = children[j]
+                if step == 1:
+                    w, x = edges[j]
+                else:
+                    x, w = edges[j - 1]
+                if t >= self.n:
+                    to_augment.append((t, w))
+
+                j += step
+                t = children[j]
+                if t >= self.n:
+                    to_augment.append((t, x))
+
+                self.mate[w] = x
+                self.mate[x] = w
+
+            # rotate the sub-blossoms to put the new base first
+            self.blossom_children[blossom] = children[i:] + children[:i]
+            self.blossom_edges[blossom] = edges[i:] + edges[:i]
+            self.blossom_base[blossom] = vertex
+
+    def augment_matching(self, v: int, w: int) -> None:
+        """Augment the matching along the path through edge (v, w).
+
+        Args:
+            v: First S-vertex of the augmenting path
+            w: Second S-vertex of the augmenting path
+        """
+        for start, end in ((v, w), (w, v)):
+            s, j = start, end
+            while True:
+                bs = self.in_blossom[s]
+                if bs >= self.n:
+                    self.augment_blossom(bs, s)
+                self.mate[s] = j
+
+                if self.label_edge[bs] is None:
+                    # reached the single vertex at the root of the tree
+                    break
+
+                t = self.label_edge[bs][0]
+                bt = self.in_blossom[t]
+                s, j = self.label_edge[bt]
+                if bt >= self.n:
+                    self.augment_blossom(bt, j)
+                self.mate[j] = s
+
+    def update_duals(self) -> bool:
+        """Change the dual variables to make a new edge tight.
+
+        Returns:
+            False if no change is possible, meaning the matching is optimal
+        """
+        n = self.n
+        delta = np.inf
+        delta_edge = None
+        delta_blossom = -1
+
+        # minimum slack of an edge between an S-vertex and a free vertex
+        top_labels = self.label[self.in_blossom]
+        free = np.flatnonzero((top_labels == FREE) & (self.best_from[:n] != -1))
+        if len(free) > 0:
+            slacks = (
+                self.dual[self.best_from[free]]
+                + self.dual[free]
+                - 2 * self.gains[self.best_from[free], free]
+            )
+            i = np.argmin(slacks)
+            delta = slacks[i]
+            delta_edge = (int(self.best_from[free[i]]), int(free[i]))
+
+        # half the minimum slack of an edge between two S-blossoms
+        top_s = np.flatnonzero(
+            (self.blossom_parent == -1)
+            & (self.label == S_LABEL)
+            & (self.best_from != -1)
+        )
+        if len(top_s) > 0:
+            sources = self.best_from[top_s]
+            targets = self.best_to[top_s]
+            slacks = (
+                self.dual[sources]
+                + self.dual[targets]
+                - 2 * self.gains[sources, targets]
+            ) / 2
+            i = np.argmin(slacks)
+            if slacks[i] < delta:
+                delta = slacks[i]
+                delta_edge = (int(sources[i]), int(targets[i]))
+
+        # minimum dual variable of a T-blossom
+        top_t = np.flatnonzero(
+            self.active_blossoms
+            & (self.blossom_parent == -1)
+            & (self.label == T_LABEL)
+        )
+        if len(top_t) > 0:
+            i = np.argmin(self.blossom_dual[top_t])
+            if self.blossom_dual[top_t[i]] < delta:
+                delta = self.blossom_dual[top_t[i]]
+                delta_edge = None
+                delta_blossom = int(top_t[i])
+
+        if delta_edge is None and delta_blossom == -1:
+            return False
+
+        self.dual[top_labels == S_LABEL] -= delta
+        self.dual[top_labels == T_LABEL] += delta
+        top_blossoms = self.active_blossoms & (self.blossom_parent == -1)
+        self.blossom_dual[top_blossoms & (self.label == S_LABEL)] += delta
+        self.blossom_dual[top_blossoms & (self.label == T_LABEL)] -= delta
+
+        if delta_blossom != -1:
+            self.expand_blossom(delta_blossom, endstage=False)
+        else:
+            v, w = delta_edge
+            self.allowed[v, w] = self.allowed[w, v] = True
+            self.queue.append(v)
+        return True
+
+
+def minimum_weight_perfect_matching(weights: np.ndarray) -> list[Edge]:
+    """Compute a minimum weight perfect matching of a complete graph.
+
+    Args:
+        weights: Symmetric (n, n) array of edge weights, with n even
+
+    Returns:
+        Matched pairs of vertices as ordered pairs
+    """
+    return BlossomMatching(weights).solve()
+
+
+def perfect_matching(
+    weights: np.ndarray, strategy: str = "exact"
+) -> list[Edge]:
+    """Compute a perfect matching of a complete graph with a given strategy.
+
+    Args:
+        weights: Symmetric (n, n) array of edge weights, with n even
+        strategy: 'exact' for a minimum weight perfect matching, 'greedy' for
+            the greedy matching, or 'greedy_2opt' for the greedy matching
+            improved by exchanges between matched pairs
+
+    Returns:
+        Matched pairs of vertices as ordered pairs
+
+    Raises:
+        ValueError: If the strategy is unknown, or a greedy strategy is given
+            an odd number of vertices
+    """
+    if strategy == "exact":
+        return minimum_weight_perfect_matching(weights)
+    if strategy == "greedy":
+        return greedy_matching(weights)
+    if strategy == "greedy_2opt":
+        return improve_matching(weights, greedy_matching(weights))
+
+    msg = f"unknown matching strategy {strategy!r}, use {MATCHING_STRATEGIES}"
+    raise ValueError(msg)
+
+
+def nearest_neighbors(weights: np.ndarray, k: int) -> np.ndarray:
+    """Find the k nearest neighbours of every vertex.
+
+    Args:
+        weights: Symmetric (n, n) array of edge weights
+        k: Number of neighbours, between 1 and n - 1
+
+    Returns:
+        (n, k) array whose row v holds the k nearest neighbours of v, in no
+        particular order
+    """
+    masked_weights = np.array(weights, dtype=np.float64)
+    np.fill_diagonal(masked_weights, np.inf)
+    return np.argpartition(masked_weights, k - 1, axis=1)[:, :k]
+
+
+def greedy_matching(
+    weights: np.ndarray, candidates: int = GREEDY_CANDIDATES
+) -> list[Edge]:
+    """Compute a perfect matching by matching the lightest edges first.
+
+    The edges to the nearest neighbours of every vertex are sorted by weight
+    and matched whenever both of their ends are single, in O(m log m) time for
+    m candidate edges. Vertices left single are matched again among
+    themselves, until all of them are matched.
+
+    Args:
+        weights: Symmetric (n, n) array of edge weights, with n even
+        candidates: Number of nearest neighbours of every vertex whose edges
+            are considered
+
+    Returns:
+        Matched pairs of vertices as ordered pairs
+
+    Raises:
+        ValueError: If the number of vertices is odd
+    """
+    n = len(weights)
+    if n % 2 == 1:
+        msg = f"perfect matching needs an even number of vertices, got {n}"
+        raise ValueError(msg)
+
+    matched_pairs = []
+    remaining = np.arange(n)
+
+    while len(remaining) > 0:
+        remaining_weights = (
+            weights
+            if len(remaining) == n
+            else weights[np.ix_(remaining, remaining)]
+        )
+        k = min(candidates, len(remaining) - 1)
+        sources = np.repeat(np.arange(len(remaining)), k)
+        targets = nearest_neighbors(remaining_weights, k).ravel()
+        order = np.argsort(remaining_weights[sources, targets], kind="stable")
+
+        matched = [False] * len(remaining)
+        for i, j in zip(
+            sources[order].tolist(), targets[order].tolist(), strict=True
+        ):
+            if not matched[i] and not matched[j]:
+                matched[i] = matched[j] = True
+                u, v = int(remaining[i]), int(remaining[j])
+                matched_pairs.append((min(u, v), max(u, v)))
+
+        remaining = remaining[~np.array(matched)]
+
+    return matched_pairs
+
+
+def improve_matching(
+    weights: np.ndarray,
+    matched_pairs: list[Edge],
+    candidates: int = GREEDY_CANDIDATES,
+) -> list[Edge]:
+    """Improve a perfect matching with exchanges between matched pairs.
+
+    For matched pairs (a, b) and (c, d), where c is one of the nearest
+    neighbours of a, the pairs are replaced by (a, c) and (b, d) when this
+    lowers the weight of the matching. Vertices are processed from a work
+    queue, and the four vertices of every exchange are queued again, until no
+    exchange improves the matching.
+
+    Args:
+        weights: Symmetric (n, n) array of edge weights
+        matched_pairs: Perfect matching to improve
+        candidates: Number of nearest neighbours of every vertex tried as new
+            partners
+
+    Returns:
+        Matched pairs of vertices as ordered pairs
+    """
+    n = len(weights)
+    if not matched_pairs:
+        return matched_pairs
+
+    mate = [-1] * n
+    for u, v in matched_pairs:
+        mate[u] = v
+        mate[v] = u
+
+    nearest = nearest_neighbors(weights, min(candidates, n - 1)).tolist()
+    queue = list(range(n))
+    queued = [True] * n
+
+    while queue:
+        a = queue.pop()
+        queued[a] = False
+        b = mate[a]
+
+        for c in nearest[a]:
+            d = mate[c]
+            if c == b:
+                continue
+
+            current_weight = weights[a, b] + weights[c, d]
+            gain = current_weight - weights[a, c] - weights[b, d]
+            if gain > GAIN_TOLERANCE * current_weight:
+                mate[a], mate[c], mate[b], mate[d] = c, a, d, b
+                for vertex in (a, b, c, d):
+                    if not queued[vertex]:
+                        queued[vertex] = True
+                        queue.append(vertex)
+                break
+
+    return [(v, w) for v, w in enumerate(mate) if v < w]
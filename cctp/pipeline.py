@@ -0,0 +1,118 @@
+"""Pipeline running the CCTP solvers on a shared Christofides tour.
+
+This module provides an instance object bundling a graph with its blocked
+edges. The Christofides tour of the graph is computed once and handed to the
+CR and CNN solvers as a read-only tuple, so that both solvers and the
+Christofides baseline can be evaluated for the price of a single tour.
+"""
+
+from .blocked import BlockedEdges, as_blocked_index
+from .cache import cached_christofides_tsp
+from .cnn import cnn_cctp
+from .cr import cr_cctp
+from .instances import (
+    GraphLike,
+    as_array_graph,
+    index_edges,
+    label_nodes,
+    node_labels,
+)
+from .types import Node, Path, Weight
+
+
+class Instance:
+    """CCTP instance whose Christofides tour is shared between the solvers.
+
+    The graph and the blocked edges are converted once to their array-backed
+    and indexed representations, and the Christofides tour is computed on
+    first use and cached. Tours are returned with the node labels of the
+    given graph.
+
+    Attributes:
+        graph: Array-backed graph of the instance
+        blocked_edges: Index of the edges that cannot be traversed
+        matching: Matching strategy of the Christofides tour
+        starts: Number of Eulerian circuit starts tried for the
+            Christofides tour
+        local_search_time: Time budget in seconds of the local search
+            improving the Christofides tour, skipped when None
+    """
+
+    def __init__(
+        self,
+        graph: GraphLike,
+        blocked_edges: BlockedEdges,
+        matching: str = "exact",
+        starts: int = 1,
+        local_search_time: float | None = None,
+    ) -> None:
+        """Create an instance from a graph and its blocked edges.
+
+        Args:
+            graph: Complete graph with weighted edges, or array-backed graph
+            blocked_edges: Edges that cannot be traversed, as a set or an index
+            matching: Matching strategy of the Christofides tour
+            starts: Number of Eulerian circuit starts tried for the
+                Christofides tour
+            local_search_time: Time budget in seconds of the local search
+                improving the Christofides tour, skipped when None
+        """
+        self._labels = node_labels(graph)
+        self.graph = as_array_graph(graph)
+        if self._labels is not None:
+            blocked_edges = index_edges(blocked_edges, self._labels)
+        self.blocked_edges = as_blocked_index(blocked_edges, len(self.graph))
+        self.matching = matching
+        self.starts = starts
+        self.local_search_time = local_search_time
+        self._christofides: tuple[tuple[Node, ...], Weight] | None = None
+
+    def christofides(self) -> tuple[tuple[Node, ...], Weight]:
+        """Return the Christofides tour of the graph and its weight.
+
+        Returns:
+            Tuple containing the closed tour, as a read-only tuple of nodes,
+            and its total weight
+        """
+        tour, tour_weight = self._shared_christofides()
+        return tuple(label_nodes(tour, self._labels)), tour_weight
+
+    def cr(self) -> tuple[Path, Weight]:
+        """Solve the instance with CR starting from the shared tour."""
+        tour, _ = self._shared_christofides()
+        path, path_weight = cr_cctp(self.graph, self.blocked_edges, tour)
+        return label_nodes(path, self._labels), path_weight
+
+    def cnn(self) -> tuple[Path, Weight]:
+        """Solve the instance with CNN starting from the shared tour."""
+        tour, _ = self._shared_christofides()
+        path, path_weight = cnn_cctp(self.graph, self.blocked_edges, tour)
+        return label_nodes(path, self._labels), path_weight
+
+    def _shared_christofides(self) -> tuple[tuple[Node, ...], Weight]:
+        """Return the Christofides tour on the nodes of the array graph."""
+        if self._christofides is None:
+            tour, tour_weight = cached_christofides_tsp(
+                self.graph,
+                matching=self.matching,
+                starts=self.starts,
+                local_search_time=self.local_search_time,
+            )
+            self._christofides = (tuple(tour), tour_weight)
+        return self._christofides
+
+    def solve(self) -> dict[str, Weight]:
+        """Run every solver on the instance.
+
+        Returns:
+            Dictionary mapping 'christofides', 'cr' and 'cnn' to the weight of
+            the tour found by each of them
+        """
+        _, christofides_cost = self.christofides()
+        _, cr_cost = self.cr()
+        _, cnn_cost = self.cnn()
+        return {
+            "christofides": christofides_cost,
+            "cr": cr_cost,
+            "cnn": cnn_cost,
+        }
@@ -1,18 +1,27 @@
-"""Find the optimal solution to TSP using brute force enumeration.
+"""Find the optimal solution to TSP with exact algorithms.
 
-This module implements a brute force approach to solve the Traveling Salesman
-Problem exactly by examining all possible permutations of vertices.
+This module implements exact solvers for the Traveling Salesman Problem: a
+brute force approach examining all possible permutations of vertices, the
+Held-Karp dynamic program over subsets of vertices, which reaches about twenty
+vertices, and a branch and bound on edges bounded by 1-trees, whose running
+time depends on the instance far more than on its size.
 """
 
+import heapq
+import itertools
+import math
 from itertools import permutations
+from typing import NamedTuple
 
-import networkx as nx
+import numpy as np
 
-from .types import Path, Weight
+from .christofides import christofides_tsp
+from .instances import GraphLike, as_array_graph, label_nodes, node_labels
+from .types import Edge, Node, Path, Weight
 from .utils import calculate_path_weight
 
 
-def optimal_tsp(graph: nx.Graph) -> tuple[Path, Weight]:
+def optimal_tsp(graph: GraphLike) -> tuple[Path, Weight]:
     """Find the optimal TSP solution by evaluating all possible paths.
 
     Computes the exact solution to the Traveling Salesman Problem by generating
@@ -20,7 +29,8 @@ def optimal_tsp(graph: nx.Graph) -> tuple[Path, Weight]:
     approach guarantees optimality but has factorial time complexity O(n!).
 
     Args:
-        graph: Undirected weighted graph where edges have a 'weight' attribute
+        graph: Undirected weighted graph where edges have a 'weight' attribute,
+            or array-backed graph
 
     Returns:
         A tuple containing the optimal path as a list of nodes and its total
@@ -41,3 +51,520 @@ def optimal_tsp(graph: nx.Graph) -> tuple[Path, Weight]:
             best_path = path[:-1]
 
     return best_path, best_cost
+
+
+# Largest number of vertices solved by held_karp_tsp, since its time and memory
+# double with every vertex, 22 vertices taking about 6 s and 0.4 GB
+HELD_KARP_MAX_NODES = 22
+
+
+def held_karp_tsp(graph: GraphLike) -> tuple[Path, Weight]:
+    """Find the optimal TSP solution with the Held-Karp dynamic program.
+
+    For every subset S of the vertices other than the first one and every
+    vertex j of S, computes the weight of the shortest path starting at the
+    first vertex, visiting all the vertices of S and ending at j. Subsets are
+    processed by increasing size, every layer being computed from the
+    previous one with vectorized operations, in O(2^n n^2) time. Only two
+    layers of weights are kept in memory, along with the predecessor of the
+    last vertex of every path, stored on one byte.
+
+    Args:
+        graph: Undirected weighted graph where edges have a 'weight' attribute,
+            or array-backed graph
+
+    Returns:
+        A tuple containing the optimal path as a list of nodes and its total
+        weight, where the path starts at the first node but doesn't repeat it
+
+    Raises:
+        ValueError: If the graph has more than HELD_KARP_MAX_NODES vertices
+    """
+    labels = node_labels(graph)
+    graph = as_array_graph(graph)
+    n = len(graph)
+    if n > HELD_KARP_MAX_NODES:
+        msg = (
+            f"held_karp_tsp solves at most {HELD_KARP_MAX_NODES} vertices, "
+            f"got {n}"
+        )
+        raise ValueError(msg)
+    if n <= 1:
+        return label_nodes(range(n), labels), 0.0
+
+    weights = graph.submatrix(range(n))
+
+    # subsets of the m vertices 1 to n - 1 are bitmasks, vertex i + 1 being
+    # bit i, and a subset is stored at its rank among the subsets of its size
+    m = n - 1
+    masks = np.arange(1 << m, dtype=np.int64)
+    sizes = np.zeros(1 << m, dtype=np.int64)
+    for bit in range(m):
+        sizes += (masks >> bit) & 1
+    layer_masks = [masks[sizes == size] for size in range(m + 1)]
+    ranks = np.empty(1 << m, dtype=np.int64)
+    for size_masks in layer_masks:
+        ranks[size_masks] = np.arange(len(size_masks))
+
+    # paths visiting a single vertex go straight from the first vertex
+    path_weights = np.full((m, m), np.inf)
+    path_weights[np.arange(m), np.arange(m)] = weights[0, 1:]
+    predecessors = [np.full((m, m), -1, dtype=np.int8)]
+
+    inner_weights = weights[1:, 1:]
+    for size in range(2, m + 1):
+        size_masks = layer_masks[size]
+        next_weights = np.full((len(size_masks), m), np.inf)
+        next_predecessors = np.full((len(size_masks), m), -1, dtype=np.int8)
+
+        for last in range(m):
+            # extend the paths over the subset without the last vertex
+            has_last = (size_masks >> last) & 1 == 1
+            previous = ranks[size_masks[has_last] ^ (1 << last)]
+            extended = path_weights[previous] + inner_weights[:, last]
+
+            best = np.argmin(extended, axis=1)
+            next_weights[has_last, last] = extended[np.arange(len(best)), best]
+            next_predecessors[has_last, last] = best
+
+        path_weights = next_weights
+        predecessors.append(next_predecessors)
+
+    # close the tour and follow the predecessors back from the full subset
+    tour_weights = path_weights[0] + weights[1:, 0]
+    last = int(np.argmin(tour_weights))
+    best_cost = float(tour_weights[last])
+
+    best_path = []
+    mask = (1 << m) - 1
+    for size in range(m, 0, -1):
+        best_path.append(last + 1)
+        previous = int(predecessors[size - 1][ranks[mask], last])
+        mask ^= 1 << last
+        last = previous
+    best_path.append(0)
+
+    return label_nodes(best_path[::-1], labels), best_cost
+
+
+# Degree of every node in a tour
+TOUR_DEGREE = 2
+
+# Subgradient iterations at the root of the branch and bound, and at the
+# other nodes which start from the penalties of their parent
+ROOT_ITERATIONS = 200
+NODE_ITERATIONS = 30
+
+# Factor applied to the subgradient step scale when the bound stalls
+STEP_DECAY = 0.5
+
+# Number of iterations without improvement after which the bound stalls
+STALL_ITERATIONS = 5
+
+# Relative tolerance under which a lower bound is considered to reach the
+# incumbent weight
+BOUND_TOLERANCE = 1e-9
+
+
+class SearchNode(NamedTuple):
+    """Node of the branch and bound, a subset of the tours of the graph.
+
+    Attributes:
+        required: Symmetric (n, n) boolean array of the edges every tour of
+            the node contains
+        forbidden: Symmetric (n, n) boolean array of the edges no tour of the
+            node contains
+        penalties: Node penalties the subgradient optimization starts from
+    """
+
+    required: np.ndarray
+    forbidden: np.ndarray
+    penalties: np.ndarray
+
+
+class OneTreeBound(NamedTuple):
+    """Best Held-Karp lower bound found for a node of the branch and bound.
+
+    Attributes:
+        bound: Lower bound on the weight of the tours of the node, infinite
+            when the node has no tour
+        penalties: Node penalties giving the bound
+        edges: (n, 2) array of the edges of the 1-tree giving the bound
+        degrees: Degree of every node in that 1-tree
+    """
+
+    bound: Weight
+    penalties: np.ndarray
+    edges: np.ndarray
+    degrees: np.ndarray
+
+
+def branch_and_bound_tsp(graph: GraphLike) -> tuple[Path, Weight]:
+    """Find the optimal TSP solution with a branch and bound on edges.
+
+    Starts from the tour of christofides_tsp improved by local search, and
+    explores subsets of tours, defined by required and forbidden edges, in
+    increasing order of their lower bound. Bounds are Held-Karp 1-tree bounds
+    optimized by subgradient ascent on node penalties. A node whose best
+    1-tree is a tour gives a new incumbent, and nodes whose bound reaches the
+    incumbent weight, once rounded up for integer weights, are pruned.
+    Otherwise the search branches on a free 1-tree edge at a node of degree
+    more than two, which is first forbidden and then required.
+
+    Random Euclidean instances of up to 30 vertices are usually solved in a
+    fraction of a second, and those of 40 to 60 vertices in seconds to
+    minutes. Instances with many ties between tours, such as Manhattan grids
+    of 49 vertices, can take tens of minutes since their 1-tree bounds rarely
+    prune.
+
+    Args:
+        graph: Undirected weighted graph where edges have a 'weight' attribute,
+            or array-backed graph
+
+    Returns:
+        A tuple containing the optimal path as a list of nodes and its total
+        weight, where the path starts at the first node but doesn't repeat it
+    """
+    labels = node_labels(graph)
+    graph = as_array_graph(graph)
+    n = len(graph)
+    if n <= TOUR_DEGREE:
+        best_path, best_cost = held_karp_tsp(graph)
+        return label_nodes(best_path, labels), best_cost
+
+    weights = graph.submatrix(range(n))
+
+    # tours of graphs with integer weights weigh at least the ceiling of any
+    # of their lower bounds
+    integral = bool(np.all(weights == np.round(weights)))
+
+    tour, best_cost = christofides_tsp(graph, local_search_time=math.inf)
+    best_path = tour[:-1]
+
+    no_edges = np.zeros((n, n), dtype=np.bool_)
+    forbidden = np.eye(n, dtype=np.bool_)
+    root = SearchNode(no_edges, forbidden, np.zeros(n))
+    bounded_nodes = [
+        (root, one_tree_bound(weights, root, best_cost, ROOT_ITERATIONS))
+    ]
+
+    # the counter breaks ties between equal bounds in insertion order
+    counter = itertools.count()
+    heap = []
+
+    while True:
+        for node, node_bound in bounded_nodes:
+            if bound_reaches(node_bound.bound, best_cost, integral):
+                continue
+
+            # a 1-tree in which every node has degree two is a tour
+            if np.all(node_bound.degrees == TOUR_DEGREE):
+                best_cost = node_bound.bound
+                best_path = tour_from_edges(node_bound.edges, n)
+                continue
+
+            heapq.heappush(
+                heap, (node_bound.bound, next(counter), node, node_bound)
+            )
+
+        # take the most promising node that can still be improved
+        while heap:
+            bound, _, node, node_bound = heapq.heappop(heap)
+            if not bound_reaches(bound, best_cost, integral):
+                break
+        else:
+            break
+
+        bounded_nodes = [
+            (child, one_tree_bound(weights, child, best_cost, NODE_ITERATIONS))
+            for child in branch(node, node_bound)
+        ]
+
+    best_cost = graph.path_weight([*best_path, best_path[0]])
+    return label_nodes(best_path, labels), best_cost
+
+
+def bound_reaches(bound: Weight, upper_bound: Weight, integral: bool) -> bool:
+    """Check whether a lower bound rules out improving on an upper bound.
+
+    Args:
+        bound: Lower bound on the weight of the tours of a node
+        upper_bound: Weight of the best known tour
+        integral: Whether all the edge weights are integers
+
+    Returns:
+        True if no tour of the node is lighter than the best known tour
+    """
+    if integral and math.isfinite(bound):
+        bound = math.ceil(bound - BOUND_TOLERANCE * max(1.0, abs(bound)))
+    return bound >= upper_bound * (1 - BOUND_TOLERANCE)
+
+
+def branch(node: SearchNode, node_bound: OneTreeBound) -> list[SearchNode]:
+    """Split a node of the branch and bound in two on a 1-tree edge.
+
+    The edge is a 1-tree edge at the node of highest degree that is not yet
+    required, going to the neighbour of highest degree. It is forbidden in
+    the first child and required in the second one, and the consequences of
+    both decisions are propagated.
+
+    Args:
+        node: Node to split
+        node_bound: Best 1-tree bound of the node, which is not a tour
+
+    Returns:
+        Children of the node that still contain tours
+    """
+    vertex = int(np.argmax(node_bound.degrees))
+    u, v = node_bound.edges.T
+    incident = ((u == vertex) | (v == vertex)) & ~node.required[u, v]
+    neighbors = np.where(u == vertex, v, u)[incident]
+    other = int(neighbors[np.argmax(node_bound.degrees[neighbors])])
+
+    children = []
+    for require in (False, True):
+        required = node.required.copy()
+        forbidden = node.forbidden.copy()
+        decided = required if require else forbidden
+        decided[vertex, other] = decided[other, vertex] = True
+        if fix_edges(required, forbidden):
+            children.append(
+                SearchNode(required, forbidden, node_bound.penalties)
+            )
+    return children
+
+
+def fix_edges(required: np.ndarray, forbidden: np.ndarray) -> bool:
+    """Propagate the consequences of required and forbidden edges in place.
+
+    A node with two required edges has all its other edges forbidden, and a
+    node with only two edges left has both of them required. An edge closing
+    a path of required edges into a cycle shorter than a tour is forbidden.
+
+    Args:
+        required: Symmetric boolean array of the required edges, updated
+        forbidden: Symmetric boolean array of the forbidden edges, updated
+
+    Returns:
+        False if no tour contains all the required edges and none of the
+        forbidden ones
+    """
+    n = len(required)
+    changed = True
+    while changed:
+        changed = False
+        if np.any(required & forbidden):
+            return False
+
+        required_degrees = required.sum(axis=1)
+        allowed_degrees = n - forbidden.sum(axis=1)
+        if np.any(required_degrees > TOUR_DEGREE) or np.any(
+            allowed_degrees < TOUR_DEGREE
+        ):
+            return False
+
+        # nodes whose two edges are decided
+        for vertex in np.flatnonzero(
+            (required_degrees == TOUR_DEGREE) & (allowed_degrees > TOUR_DEGREE)
+        ):
+            forbidden[vertex] |= ~required[vertex]
+            forbidden[:, vertex] |= ~required[:, vertex]
+            changed = True
+        for vertex in np.flatnonzero(
+            (allowed_degrees == TOUR_DEGREE) & (required_degrees < TOUR_DEGREE)
+        ):
+            required[vertex] |= ~forbidden[vertex]
+            required[:, vertex] |= ~forbidden[:, vertex]
+            changed = True
+
+        if not changed:
+            closing_edges = subtour_closing_edges(required)
+            if closing_edges is None:
+                return False
+            for a, b in closing_edges:
+                if not forbidden[a, b]:
+                    forbidden[a, b] = forbidden[b, a] = True
+                    changed = True
+
+    return True
+
+
+def subtour_closing_edges(required: np.ndarray) -> list[Edge] | None:
+    """Find the edges closing paths of required edges into subtours.
+
+    Args:
+        required: Symmetric boolean array of the required edges, every node
+            having at most two of them
+
+    Returns:
+        Edges joining the two ends of every path of required edges that does
+        not cover all the nodes, or None if the required edges contain a
+        cycle shorter than a tour
+    """
+    n = len(required)
+    neighbors = [np.flatnonzero(row).tolist() for row in required]
+    visited = [False] * n
+
+    closing_edges = []
+    for start in range(n):
+        if visited[start] or len(neighbors[start]) != 1:
+            continue
+
+        # walk the path from one of its ends to the other
+        previous, current, length = -1, start, 1
+        visited[start] = True
+        while True:
+            following = [w for w in neighbors[current] if w != previous]
+            if not following:
+                break
+            previous, current = current, following[0]
+            visited[current] = True
+            length += 1
+
+        # the two nodes of a single edge are joined by that very edge
+        if length < n and not required[start, current]:
+            closing_edges.append((start, current))
+
+    # nodes of degree two left unvisited lie on cycles
+    cycle_nodes = sum(
+        1 for vertex in range(n) if not visited[vertex] and neighbors[vertex]
+    )
+    if 0 < cycle_nodes < n:
+        return None
+    return closing_edges
+
+
+def one_tree_bound(
+    weights: np.ndarray,
+    node: SearchNode,
+    upper_bound: Weight,
+    iterations: int,
+) -> OneTreeBound:
+    """Optimize the Held-Karp lower bound of a node by subgradient ascent.
+
+    With penalties p, every tour weighs as much for the weights
+    w[u, v] + p[u] + p[v] minus twice the sum of the penalties, so that the
+    minimum 1-tree for these weights gives a lower bound. Penalties move
+    along the degrees of the 1-tree minus two, with a step scaled by the gap
+    to the upper bound and halved whenever the bound stalls.
+
+    Args:
+        weights: Symmetric (n, n) array of edge weights
+        node: Node of the branch and bound
+        upper_bound: Weight of the best known tour
+        iterations: Number of subgradient iterations
+
+    Returns:
+        Best bound found, with the penalties and the 1-tree giving it
+    """
+    n = len(weights)
+    penalties = node.penalties.copy()
+    best = OneTreeBound(
+        -math.inf, penalties, np.zeros((0, 2), dtype=np.intp), np.zeros(n)
+    )
+
+    scale = 2.0
+    stalled = 0
+    for _ in range(iterations):
+        costs = weights + penalties[:, None] + penalties[None, :]
+        tree_weight, edges = minimum_one_tree(costs, node)
+        if math.isinf(tree_weight):
+            return OneTreeBound(math.inf, penalties, edges, np.zeros(n))
+
+        bound = tree_weight - 2 * penalties.sum()
+        degrees = np.bincount(edges.ravel(), minlength=n)
+        if bound > best.bound:
+            best = OneTreeBound(bound, penalties.copy(), edges, degrees)
+            stalled = 0
+        else:
+            stalled += 1
+            if stalled >= STALL_ITERATIONS:
+                scale *= STEP_DECAY
+                stalled = 0
+
+        subgradient = degrees - TOUR_DEGREE
+        squared_norm = subgradient @ subgradient
+        if squared_norm == 0 or best.bound >= upper_bound * (
+            1 - BOUND_TOLERANCE
+        ):
+            break
+        step = scale * (upper_bound - bound) / squared_norm
+        penalties = penalties + step * subgradient
+
+    return best
+
+
+def minimum_one_tree(
+    costs: np.ndarray, node: SearchNode
+) -> tuple[Weight, np.ndarray]:
+    """Compute a minimum 1-tree containing the required edges of a node.
+
+    A 1-tree is a spanning tree of the nodes 1 to n - 1 together with two
+    edges at node 0. Required edges are made cheaper than any other edge so
+    that they are chosen first, and forbidden edges are left out.
+
+    Args:
+        costs: Symmetric (n, n) array of edge costs
+        node: Node of the branch and bound
+
+    Returns:
+        Tuple containing the cost of the 1-tree, infinite if none avoids the
+        forbidden edges, and the (n, 2) array of its edges
+    """
+    n = len(costs)
+    offset = 2 * n * (np.abs(costs).max() + 1)
+    adjusted = np.where(node.forbidden, np.inf, costs)
+    adjusted[node.required] -= offset
+
+    # dense Prim on the nodes 1 to n - 1
+    in_tree = np.zeros(n, dtype=np.bool_)
+    in_tree[0] = True
+    tree_costs = np.full(n, np.inf)
+    closest_tree_nodes = np.zeros(n, dtype=np.intp)
+    edges = np.empty((n, 2), dtype=np.intp)
+
+    vertex = 1
+    for step in range(n - 2):
+        in_tree[vertex] = True
+        tree_costs[vertex] = np.inf
+        closer = (adjusted[vertex] < tree_costs) & ~in_tree
+        tree_costs[closer] = adjusted[vertex, closer]
+        closest_tree_nodes[closer] = vertex
+
+        vertex = int(np.argmin(tree_costs))
+        if math.isinf(tree_costs[vertex]):
+            return math.inf, edges[:step]
+        edges[step] = (closest_tree_nodes[vertex], vertex)
+
+    # the two cheapest edges at node 0
+    cheapest = np.argpartition(adjusted[0, 1:], 1)[:2] + 1
+    if np.isinf(adjusted[0, cheapest]).any():
+        return math.inf, edges[: n - 2]
+    edges[n - 2 :, 0] = 0
+    edges[n - 2 :, 1] = cheapest
+
+    return float(costs[edges[:, 0], edges[:, 1]].sum()), edges
+
+
+def tour_from_edges(edges: np.ndarray, n: int) -> Path:
+    """Order the edges of a Hamiltonian cycle into a path.
+
+    Args:
+        edges: (n, 2) array of the edges of the cycle
+        n: Number of nodes
+
+    Returns:
+        The cycle as a path starting at node 0, without repeating it
+    """
+    neighbors: list[list[Node]] = [[] for _ in range(n)]
+    for u, v in edges.tolist():
+        neighbors[u].append(v)
+        neighbors[v].append(u)
+
+    path = [0]
+    previous, current = -1, 0
+    for _ in range(n - 1):
+        following = next(w for w in neighbors[current] if w != previous)
+        previous, current = current, following
+        path.append(current)
+    return path
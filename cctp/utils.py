@@ -9,7 +9,10 @@ import random
 
 import networkx as nx
 import numpy as np
+from scipy.spatial import distance
 
+from .blocked import BlockedEdgeIndex
+from .instances import GraphLike
 from .types import Edge, Path, Weight
 
 
@@ -62,34 +65,63 @@ def create_random_graph(
     return create_complete_graph_from_points(points)
 
 
-def create_random_blocks(n: int, graph: nx.Graph) -> set[Edge]:
+def create_random_blocks(n: int, graph: GraphLike) -> BlockedEdgeIndex:
     """Select n random edges to block from the graph.
 
-    Randomly selects n edges from the graph to be marked as blocked.
+    Randomly selects n edges from the graph to be marked as blocked. Edges of
+    networkx graphs are drawn from their edge list, while edges of array-backed
+    complete graphs are drawn by index without listing all node pairs.
 
     Args:
         n: Number of edges to block
         graph: Graph from which to select edges
 
     Returns:
-        Set of edges (formatted as ordered node pairs) that are blocked
+        Index of the edges (formatted as ordered node pairs) that are blocked
     """
+    if not isinstance(graph, nx.Graph):
+        total_pairs = len(graph) * (len(graph) - 1) // 2
+        pair_indices = random.sample(range(total_pairs), n)
+        return BlockedEdgeIndex(
+            len(graph), (unrank_edge(i, len(graph)) for i in pair_indices)
+        )
+
     edges = list(graph.edges())
-    blocked_edges = set()
+    blocked_edges = BlockedEdgeIndex(len(graph))
     for _ in range(n):
         u, v = random.choice(edges)
-        blocked_edges.add(edge(u, v))
+        blocked_edges.add(*edge(u, v))
         edges.remove((u, v))
     return blocked_edges
 
 
+def unrank_edge(index: int, n: int) -> Edge:
+    """Find the ordered node pair at a given rank among all pairs.
+
+    Pairs (u, v) with u < v of the complete graph on n nodes are ranked in
+    lexicographic order, so that rank 0 is (0, 1) and rank n - 1 is (1, 2).
+
+    Args:
+        index: Rank of the pair, between 0 and n * (n - 1) / 2 - 1
+        n: Number of nodes of the complete graph
+
+    Returns:
+        Ordered node pair with the given rank
+    """
+    u = n - 2 - (math.isqrt(4 * n * (n - 1) - 8 * index - 7) - 1) // 2
+    v = index - u * (2 * n - u - 1) // 2 + u + 1
+    return (u, v)
+
+
 def create_complete_graph_from_points(
     coordinate_points: list[tuple[float, float]],
 ) -> nx.Graph:
     """Create a complete graph from a list of 2D coordinate points.
 
     Builds a complete graph where nodes correspond to the given coordinates and
-    edge weights are the Euclidean distances between points.
+    edge weights are the Euclidean distances between points. All pairwise
+    distances are computed in a single condensed-distance pass and loaded into
+    the graph in bulk.
 
     Args:
         coordinate_points: List of (x, y) coordinates
@@ -98,16 +130,19 @@ def create_complete_graph_from_points(
         Complete graph with nodes at the specified coordinates
     """
     complete_graph = nx.Graph()
-
-    for point_index, point_coordinates in enumerate(coordinate_points):
-        complete_graph.add_node(point_index, pos=point_coordinates)
-
-    for i in range(len(coordinate_points)):
-        for j in range(i + 1, len(coordinate_points)):
-            distance_weight = euclidean_distance(
-                coordinate_points[i], coordinate_points[j]
-            )
-            complete_graph.add_edge(i, j, weight=distance_weight)
+    complete_graph.add_nodes_from(
+        (point_index, {"pos": point_coordinates})
+        for point_index, point_coordinates in enumerate(coordinate_points)
+    )
+
+    points = np.asarray(coordinate_points, dtype=np.float64).reshape(-1, 2)
+    distance_weights = distance.pdist(points)
+    rows, cols = np.triu_indices(len(points), k=1)
+    complete_graph.add_weighted_edges_from(
+        zip(
+            rows.tolist(), cols.tolist(), distance_weights.tolist(), strict=True
+        )
+    )
 
     return complete_graph
 
@@ -127,10 +162,11 @@ def euclidean_distance(
     return np.sqrt((point1[0] - point2[0]) ** 2 + (point1[1] - point2[1]) ** 2)
 
 
-def calculate_path_weight(graph: nx.Graph, path: Path) -> Weight:
+def calculate_path_weight(graph: GraphLike, path: Path) -> Weight:
     """Calculate the total weight of a path in a graph.
 
-    Sums the weights of edges along the given path.
+    Sums the weights of edges along the given path. Array-backed graphs sum
+    the weights in a single vectorized lookup.
 
     Args:
         graph: Graph containing the path
@@ -139,6 +175,9 @@ def calculate_path_weight(graph: nx.Graph, path: Path) -> Weight:
     Returns:
         Total weight of all edges in the path
     """
+    if not isinstance(graph, nx.Graph):
+        return graph.path_weight(path)
+
     total_path_weight: Weight = 0.0
     for i in range(len(path) - 1):
         vertex_u, vertex_v = path[i], path[i + 1]
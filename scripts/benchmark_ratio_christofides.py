@@ -11,7 +11,7 @@ from cctp import christofides, tsp, utils
 def main():
     seed = 42
     min_n = 4
-    max_n = 10
+    max_n = 16
     step = 1
     repeats = 20
 
@@ -25,7 +25,7 @@ def main():
         ratios = []
         for _ in tqdm(range(repeats), desc=f"Testing n={n}", leave=False):
             graph = utils.create_random_graph(n)
-            _, optimal_cost = tsp.optimal_tsp(graph)
+            _, optimal_cost = tsp.held_karp_tsp(graph)
             _, christofides_cost = christofides.christofides_tsp(graph)
             ratios.append(christofides_cost / optimal_cost)
 
@@ -5,7 +5,7 @@ from pathlib import Path
 import numpy as np
 from tqdm import tqdm
 
-from cctp import christofides, cnn, graphs, utils
+from cctp import graphs, pipeline, utils
 
 
 def main():
@@ -28,10 +28,9 @@ def main():
         ratios = []
         for _ in tqdm(range(repeats), desc=f"Testing p={p} n={n}", leave=False):
             graph, blocked_edges = graphs.cnn_tight_bound_graph(int(p))
-            christofides_tour, christofides_cost = (
-                christofides.christofides_tsp(graph)
-            )
-            _, cnn_cost = cnn.cnn_cctp(graph, blocked_edges)
+            instance = pipeline.Instance(graph, blocked_edges)
+            _, christofides_cost = instance.christofides()
+            _, cnn_cost = instance.cnn()
             ratios.append(cnn_cost / christofides_cost)
 
         stats = utils.compute_stats(ratios)
@@ -5,7 +5,7 @@ from pathlib import Path
 import numpy as np
 from tqdm import tqdm
 
-from cctp import christofides, cr, graphs, utils
+from cctp import graphs, pipeline, utils
 
 
 def main():
@@ -28,11 +28,10 @@ def main():
         ratios = []
         for _ in tqdm(range(repeats), desc=f"Testing p={p} n={n}", leave=False):
             graph, blocked_edges = graphs.cr_tight_bound_graph(int(p))
-            christofides_tour, christofides_cost = (
-                christofides.christofides_tsp(graph)
-            )
+            instance = pipeline.Instance(graph, blocked_edges)
+            _, christofides_cost = instance.christofides()
 
-            cr_tour, cr_cost = cr.cr_cctp(graph, blocked_edges)
+            cr_tour, cr_cost = instance.cr()
 
             ratios.append(cr_cost / christofides_cost)
 
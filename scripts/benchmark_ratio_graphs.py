@@ -7,7 +7,7 @@ import networkx as nx
 import numpy as np
 from tqdm import tqdm
 
-from cctp import christofides, cnn, cr, graphs, utils
+from cctp import graphs, pipeline, utils
 
 
 def benchmark_graph_n(
@@ -37,14 +37,9 @@ def benchmark_graph_n(
         for _ in tqdm(range(repeats), desc=f"Testing n={n}", leave=False):
             graph = create_graph(w)
             blocked_edges = utils.create_random_blocks(n - 2, graph)
-            christofides_tour, christofides_cost = (
-                christofides.christofides_tsp(graph)
-            )
-            _, cr_cost = cr.cr_cctp(graph, blocked_edges)
-            cr_ratios.append(cr_cost / christofides_cost)
-
-            _, cnn_cost = cnn.cnn_cctp(graph, blocked_edges)
-            cnn_ratios.append(cnn_cost / christofides_cost)
+            costs = pipeline.Instance(graph, blocked_edges).solve()
+            cr_ratios.append(costs["cr"] / costs["christofides"])
+            cnn_ratios.append(costs["cnn"] / costs["christofides"])
 
         cnn_stats = utils.compute_stats(cnn_ratios)
         results["cnn_data"][n] = {**cnn_stats, "ratios": cnn_ratios}
@@ -85,14 +80,9 @@ def benchmark_graph_k(
         for _ in tqdm(range(repeats), desc=f"Testing k={k}", leave=False):
             graph = create_graph(w)
             blocked_edges = utils.create_random_blocks(k, graph)
-            christofides_tour, christofides_cost = (
-                christofides.christofides_tsp(graph)
-            )
-            _, cr_cost = cr.cr_cctp(graph, blocked_edges)
-            cr_ratios.append(cr_cost / christofides_cost)
-
-            _, cnn_cost = cnn.cnn_cctp(graph, blocked_edges)
-            cnn_ratios.append(cnn_cost / christofides_cost)
+            costs = pipeline.Instance(graph, blocked_edges).solve()
+            cr_ratios.append(costs["cr"] / costs["christofides"])
+            cnn_ratios.append(costs["cnn"] / costs["christofides"])
 
         cnn_stats = utils.compute_stats(cnn_ratios)
         results["cnn_data"][k] = {**cnn_stats, "ratios": cnn_ratios}
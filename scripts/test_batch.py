@@ -0,0 +1,43 @@
+import math
+import random
+
+import numpy as np
+from tqdm import tqdm
+
+from cctp import christofides, instances, matching
+
+
+def main():
+    n_instances: int = 250
+
+    for _ in tqdm(range(n_instances)):
+        batch_size: int = int(random.uniform(0, 8))
+        n: int = int(random.uniform(1, 64))
+        strategy = random.choice(matching.MATCHING_STRATEGIES)
+
+        points = np.random.random((batch_size, n, 2))
+        tours, tour_weights = christofides.batch_christofides_tsp_from_points(
+            points, strategy
+        )
+
+        assert len(tours) == len(tour_weights) == batch_size, (
+            "Batch does not return one tour per instance"
+        )
+
+        weights = christofides.batch_distance_matrices(points)
+        for b in range(batch_size):
+            tour, cost = christofides.christofides_tsp(
+                instances.DistanceMatrix(weights[b]), matching=strategy
+            )
+
+            assert tours[b].tolist() == tour, (
+                f"Batch tour differs from christofides_tsp with {strategy}"
+            )
+
+            assert math.isclose(tour_weights[b], cost), (
+                "Batch tour weight differs from christofides_tsp"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import math
+import random
+import tempfile
+
+from tqdm import tqdm
+
+from cctp import cache, christofides, instances, utils
+
+
+def main():
+    n_instances: int = 100
+
+    for _ in tqdm(range(n_instances)):
+        n: int = int(random.uniform(4, 64))
+        maxsize: int = int(random.uniform(1, 4))
+
+        graphs = [utils.create_random_graph(n) for _ in range(maxsize + 1)]
+        keys = [
+            cache.graph_fingerprint(
+                instances.as_array_graph(graph),
+                "christofides",
+                "exact",
+                "starts=1",
+                "local_search_time=None",
+            )
+            for graph in graphs
+        ]
+
+        assert len(set(keys)) == len(keys), "Different graphs share a key"
+        assert keys[0] != cache.graph_fingerprint(
+            instances.as_array_graph(graphs[0])
+        ), "Options do not change the key"
+
+        with tempfile.TemporaryDirectory() as directory:
+            tour_cache = cache.TourCache(maxsize, directory)
+            memory_cache = cache.TourCache(maxsize)
+
+            # a miss computes and stores the tour, a hit returns it
+            for graph, key in zip(graphs, keys, strict=True):
+                assert key not in tour_cache, "Cache hit on a new graph"
+
+                tour, cost = cache.cached_christofides_tsp(
+                    graph, cache=tour_cache
+                )
+                assert tour == christofides.christofides_tsp(graph)[0], (
+                    "Cached tour differs from the Christofides tour"
+                )
+                assert key in tour_cache, "Computed tour was not stored"
+
+                cached_tour, cached_cost = cache.cached_christofides_tsp(
+                    graph, cache=tour_cache
+                )
+                assert cached_tour == tour, "Cache hit returned another tour"
+                assert math.isclose(cached_cost, cost), (
+                    "Cache hit returned another cost"
+                )
+
+                memory_cache.put(key, tour)
+
+            # the least recently used tour is evicted from memory only
+            assert len(tour_cache) == maxsize, "Cache exceeds its size"
+            assert memory_cache.get(keys[0]) is None, "Oldest tour not evicted"
+            assert keys[0] in tour_cache, "Evicted tour missing from disk"
+
+            # a new cache on the same directory reads the tours from disk
+            tour_cache = cache.TourCache(maxsize, directory)
+            assert len(tour_cache) == 0, "New cache is not empty in memory"
+            for graph, key in zip(graphs, keys, strict=True):
+                tour, _ = christofides.christofides_tsp(graph)
+                assert tour_cache.get(key) == tour, (
+                    "Disk tour differs from the Christofides tour"
+                )
+
+
+if __name__ == "__main__":
+    main()
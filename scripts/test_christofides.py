@@ -1,8 +1,10 @@
+import math
 import random
 
+import networkx as nx
 from tqdm import tqdm
 
-from cctp import christofides, utils
+from cctp import christofides, instances, utils
 
 
 def main():
@@ -13,18 +15,52 @@ def main():
 
         graph = utils.create_random_graph(n)
 
-        christofides_tour, _ = christofides.christofides_tsp(graph)
+        for g in (graph, instances.DistanceMatrix.from_graph(graph)):
+            christofides_tour, christofides_cost = (
+                christofides.christofides_tsp(g)
+            )
 
-        assert christofides_tour[0] == christofides_tour[-1], (
-            "Tour does not start and end at the same vertex"
+            assert christofides_tour[0] == christofides_tour[-1], (
+                "Tour does not start and end at the same vertex"
+            )
+
+            assert set(christofides_tour) == set(g.nodes()), (
+                "Tour does not contain all nodes"
+            )
+
+            visited_nodes = set(christofides_tour[:-1])
+            assert len(visited_nodes) == n, "Not all nodes visited exactly once"
+
+        # the tour from node 0 is kept unless another start finds a better one
+        starts: int = int(random.uniform(2, 9))
+        multi_start_tour, multi_start_cost, info = (
+            christofides.christofides_tsp(g, starts=starts, return_info=True)
         )
+        assert multi_start_cost <= christofides_cost, (
+            "Multi-start tour is worse than the single-start tour"
+        )
+        assert (
+            multi_start_tour == christofides_tour
+            or multi_start_cost < christofides_cost
+        ), "Multi-start tour replaced the single-start tour on a tie"
 
-        assert set(christofides_tour) == set(graph.nodes()), (
-            "Tour does not contain all nodes"
+        # shortcutting never lengthens the Eulerian circuit of a metric graph
+        assert math.isclose(info["shortcut_weight"], multi_start_cost), (
+            "Run information does not match the returned tour"
         )
+        assert info["shortcut_weight"] <= (
+            info["tree_weight"] + info["matching_weight"]
+        ) * (1 + 1e-9), "Tour is longer than its Eulerian circuit"
+        assert info["start"] in g.nodes(), "Winning start is not a node"
 
-        visited_nodes = set(christofides_tour[:-1])
-        assert len(visited_nodes) == n, "Not all nodes visited exactly once"
+        # nodes with other labels are numbered in their iteration order
+        labels = {node: f"v{node}" for node in graph.nodes()}
+        labelled_tour, _ = christofides.christofides_tsp(
+            nx.relabel_nodes(graph, labels)
+        )
+        assert labelled_tour == [labels[node] for node in christofides_tour], (
+            "Tour depends on the node labels"
+        )
 
 
 if __name__ == "__main__":
@@ -1,8 +1,35 @@
 import random
 
+import networkx as nx
 from tqdm import tqdm
 
-from cctp import cnn, utils
+from cctp import blocked, cache, cnn, instances, utils
+from cctp.types import Edge
+
+
+def check_blocked_index(
+    index: blocked.BlockedEdgeIndex, blocked_edges: set[Edge]
+) -> None:
+    """Check that an index holds exactly a set of blocked edges."""
+    assert len(index) == len(blocked_edges), "Index has a wrong size"
+    assert set(index) == blocked_edges, "Index holds other edges"
+
+    blocked_neighbors = [set() for _ in range(index.n)]
+    for u, v in blocked_edges:
+        blocked_neighbors[u].add(v)
+        blocked_neighbors[v].add(u)
+    for u in range(index.n):
+        assert set(index.neighbors(u)) == blocked_neighbors[u], (
+            "Index has wrong blocked neighbours"
+        )
+        assert index.degree(u) == len(blocked_neighbors[u]), (
+            "Index has a wrong blocked degree"
+        )
+
+    matrix = index.as_matrix()
+    assert set(blocked.BlockedEdgeIndex.from_matrix(matrix)) == blocked_edges, (
+        "Index does not survive the matrix round trip"
+    )
 
 
 def main():
@@ -15,22 +42,52 @@ def main():
         graph = utils.create_random_graph(n)
         blocked_edges = utils.create_random_blocks(k, graph)
 
-        cnn_tour, _ = cnn.cnn_cctp(graph, blocked_edges)
+        distance_matrix = instances.DistanceMatrix.from_graph(graph)
+        coordinate_graph = instances.CoordinateGraph(distance_matrix.points)
 
-        assert cnn_tour[0] == cnn_tour[-1], (
-            "Tour does not start and end at the same vertex"
+        # blockages above the dense fraction get the byte matrix by default
+        n_pairs = n * (n - 1) // 2
+        dense_blocked_edges = utils.create_random_blocks(
+            int(2 * blocked.DENSE_FRACTION * n_pairs) + 1, distance_matrix
         )
+        assert dense_blocked_edges.dense, "Dense blockage uses neighbour sets"
 
-        assert set(cnn_tour) == set(graph.nodes()), (
-            "Tour did not contain all nodes"
-        )
+        for edges in (set(blocked_edges), set(dense_blocked_edges)):
+            for dense in (False, True):
+                check_blocked_index(
+                    blocked.BlockedEdgeIndex(n, edges, dense=dense), edges
+                )
 
-        edges = [
-            utils.edge(cnn_tour[i], cnn_tour[i + 1])
-            for i in range(len(cnn_tour) - 1)
-        ]
-        assert len(set(blocked_edges) & set(edges)) == 0, (
-            "Tour contains a blocked edge"
+        for g in (graph, coordinate_graph, distance_matrix):
+            # compute the Christofides tour again for every backend
+            cache.DEFAULT_TOUR_CACHE.clear()
+
+            cnn_tour, _ = cnn.cnn_cctp(g, blocked_edges)
+
+            assert cnn_tour[0] == cnn_tour[-1], (
+                "Tour does not start and end at the same vertex"
+            )
+
+            assert set(cnn_tour) == set(g.nodes()), (
+                "Tour did not contain all nodes"
+            )
+
+            edges = [
+                utils.edge(cnn_tour[i], cnn_tour[i + 1])
+                for i in range(len(cnn_tour) - 1)
+            ]
+            assert len(set(blocked_edges) & set(edges)) == 0, (
+                "Tour contains a blocked edge"
+            )
+
+        # nodes with other labels are numbered in their iteration order
+        labels = {node: f"v{node}" for node in graph.nodes()}
+        labelled_tour, _ = cnn.cnn_cctp(
+            nx.relabel_nodes(graph, labels),
+            {utils.edge(labels[u], labels[v]) for u, v in blocked_edges},
+        )
+        assert labelled_tour == [labels[node] for node in cnn_tour], (
+            "Tour depends on the node labels"
         )
 
 
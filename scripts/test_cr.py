@@ -1,8 +1,20 @@
+import math
 import random
 
+import networkx as nx
+import numpy as np
 from tqdm import tqdm
 
-from cctp import cr, utils
+from cctp import (
+    cache,
+    christofides,
+    cnn,
+    cr,
+    graphs,
+    instances,
+    pipeline,
+    utils,
+)
 
 
 def main():
@@ -15,24 +27,96 @@ def main():
         graph = utils.create_random_graph(n)
         blocked_edges = utils.create_random_blocks(k, graph)
 
-        cr_tour, _ = cr.cr_cctp(graph, blocked_edges)
+        distance_matrix = instances.DistanceMatrix.from_graph(graph)
+        coordinate_graph = instances.CoordinateGraph(distance_matrix.points)
 
-        assert cr_tour[0] == cr_tour[-1], (
-            "Tour does not start and end at the same vertex"
+        # the coordinates give the weights of the distance matrix
+        nodes = random.sample(range(n), int(random.uniform(1, n)))
+        assert np.allclose(
+            coordinate_graph.rows(nodes), distance_matrix.rows(nodes)
+        ), "Coordinate rows differ from the distance matrix"
+        assert np.allclose(
+            coordinate_graph.submatrix(nodes), distance_matrix.submatrix(nodes)
+        ), "Coordinate submatrix differs from the distance matrix"
+        assert all(
+            math.isclose(
+                coordinate_graph.weight(u, v), distance_matrix.weight(u, v)
+            )
+            for u, v in zip(nodes, reversed(nodes), strict=True)
+        ), "Coordinate weights differ from the distance matrix"
+        assert list(coordinate_graph.edges()) == distance_matrix.edges(), (
+            "Coordinate edges differ from the distance matrix"
         )
 
-        assert set(cr_tour) == set(graph.nodes()), (
-            "Tour did not contain all nodes"
+        for g in (graph, coordinate_graph, distance_matrix):
+            # compute the Christofides tour again for every backend
+            cache.DEFAULT_TOUR_CACHE.clear()
+
+            cr_tour, _ = cr.cr_cctp(g, blocked_edges)
+
+            assert cr_tour[0] == cr_tour[-1], (
+                "Tour does not start and end at the same vertex"
+            )
+
+            assert set(cr_tour) == set(g.nodes()), (
+                "Tour did not contain all nodes"
+            )
+
+            edges = [
+                utils.edge(cr_tour[i], cr_tour[i + 1])
+                for i in range(len(cr_tour) - 1)
+            ]
+            assert len(set(blocked_edges) & set(edges)) == 0, (
+                "Tour contains a blocked edge"
+            )
+
+        # nodes with other labels are numbered in their iteration order
+        labels = {node: f"v{node}" for node in graph.nodes()}
+        labelled_tour, _ = cr.cr_cctp(
+            nx.relabel_nodes(graph, labels),
+            {utils.edge(labels[u], labels[v]) for u, v in blocked_edges},
+        )
+        assert labelled_tour == [labels[node] for node in cr_tour], (
+            "Tour depends on the node labels"
         )
 
-        edges = [
-            utils.edge(cr_tour[i], cr_tour[i + 1])
-            for i in range(len(cr_tour) - 1)
-        ]
-        assert len(set(blocked_edges) & set(edges)) == 0, (
-            "Tour contains a blocked edge"
+        # the pipeline finds the tours of the solvers run on their own
+        cache.DEFAULT_TOUR_CACHE.clear()
+        solver_results = {
+            "christofides": christofides.christofides_tsp(graph),
+            "cr": cr.cr_cctp(graph, blocked_edges),
+            "cnn": cnn.cnn_cctp(graph, blocked_edges),
+        }
+
+        cache.DEFAULT_TOUR_CACHE.clear()
+        instance = pipeline.Instance(graph, blocked_edges)
+        costs = instance.solve()
+        for name, (tour, cost) in solver_results.items():
+            instance_tour, _ = getattr(instance, name)()
+            assert list(instance_tour) == tour, (
+                f"Pipeline {name} tour differs from the solver"
+            )
+            assert math.isclose(costs[name], cost), (
+                f"Pipeline {name} cost differs from the solver"
+            )
+
+    for p in range(2, 6):
+        graph, blocked_edges = graphs.cr_tight_bound_graph(p)
+        christofides_tour, _ = christofides.christofides_tsp(graph)
+
+        assert christofides_tour == [*graph.nodes(), 0], (
+            "Tight bound tour does not follow the nodes in order"
         )
 
+        # CR must also terminate on the tour walked in the other direction
+        for tour in (christofides_tour, christofides_tour[::-1]):
+            for g in (graph, instances.DistanceMatrix.from_graph(graph)):
+                cr_tour, _ = cr.cr_cctp(g, blocked_edges, tour)
+
+                assert set(cr_tour) == set(g.nodes()), (
+                    "Tour did not contain all nodes"
+                )
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,59 @@
+import math
+import random
+
+import networkx as nx
+from tqdm import tqdm
+
+from cctp import christofides, graphs, instances, local_search, utils
+
+
+def create_manhattan_graph(n: int) -> nx.Graph:
+    """Create a Manhattan grid graph of about n nodes."""
+    return graphs.create_manhattan_graph(math.isqrt(n) + 1)
+
+
+def create_clustered_graph(n: int) -> nx.Graph:
+    """Create a clustered graph of about n nodes."""
+    return graphs.create_clustered_graph(math.isqrt(n) + 1)
+
+
+def main():
+    n_instances: int = 500
+
+    generators = (
+        utils.create_random_graph,
+        utils.create_polygon_graph,
+        create_manhattan_graph,
+        create_clustered_graph,
+    )
+
+    for _ in tqdm(range(n_instances)):
+        n: int = int(random.uniform(2, 128))
+
+        generator = random.choice(generators)
+        graph = generator(n)
+        n = graph.number_of_nodes()
+
+        # start from a random tour as well as from the Christofides tour
+        random_tour = random.sample(range(n), n)
+        christofides_tour, _ = christofides.christofides_tsp(graph)
+
+        for tour in ([*random_tour, random_tour[0]], christofides_tour):
+            for g in (graph, instances.DistanceMatrix.from_graph(graph)):
+                improved_tour, cost = local_search.improve_tour(g, tour)
+
+                assert improved_tour[0] == improved_tour[-1] == tour[0], (
+                    "Tour does not start and end at the first node"
+                )
+
+                assert sorted(improved_tour[:-1]) == list(range(n)), (
+                    "Tour does not visit every node exactly once"
+                )
+
+                assert cost <= utils.calculate_path_weight(g, tour) + 1e-9, (
+                    "Local search made the tour longer"
+                )
+
+
+if __name__ == "__main__":
+    main()
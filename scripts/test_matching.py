@@ -0,0 +1,70 @@
+import math
+import random
+
+import networkx as nx
+from tqdm import tqdm
+
+from cctp import graphs, instances, matching, utils
+
+
+def create_grid_graph(n: int) -> nx.Graph:
+    """Create a complete graph on distinct points of a small integer grid."""
+    side = math.isqrt(2 * n) + 1
+    points = random.sample(
+        [(x, y) for x in range(side) for y in range(side)], n
+    )
+    return utils.create_complete_graph_from_points(points)
+
+
+def main():
+    n_instances: int = 250
+
+    generators = (
+        utils.create_random_graph,
+        utils.create_polygon_graph,
+        create_grid_graph,
+        graphs.create_constant_weight_graph,
+    )
+
+    for _ in tqdm(range(n_instances)):
+        n: int = 2 * int(random.uniform(1, 16))
+
+        generator = random.choice(generators)
+        graph = generator(n)
+        weights = instances.as_distance_matrix(graph).weights
+
+        optimal_cost = sum(
+            graph[u][v]["weight"] for u, v in nx.min_weight_matching(graph)
+        )
+
+        for strategy in matching.MATCHING_STRATEGIES:
+            matched_pairs = matching.perfect_matching(weights, strategy)
+
+            assert sorted(v for pair in matched_pairs for v in pair) == list(
+                range(n)
+            ), f"{strategy} matching is not perfect on {generator.__name__}"
+
+            cost = sum(weights[u, v] for u, v in matched_pairs)
+            if strategy == "exact":
+                assert math.isclose(cost, optimal_cost), (
+                    f"exact matching is not optimal on {generator.__name__}"
+                )
+            else:
+                assert cost >= optimal_cost - 1e-9 * optimal_cost, (
+                    f"{strategy} matching beats the optimal matching"
+                )
+
+    # the greedy strategies refuse graphs without a perfect matching
+    weights = instances.as_distance_matrix(utils.create_random_graph(7)).weights
+    for strategy in ("greedy", "greedy_2opt"):
+        try:
+            matching.perfect_matching(weights, strategy)
+        except ValueError:
+            pass
+        else:
+            msg = f"{strategy} matching accepted an odd number of vertices"
+            raise AssertionError(msg)
+
+
+if __name__ == "__main__":
+    main()
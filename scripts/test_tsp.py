@@ -0,0 +1,46 @@
+import math
+import random
+
+from tqdm import tqdm
+
+from cctp import tsp, utils
+
+
+def main():
+    n_instances: int = 200
+
+    for _ in tqdm(range(n_instances)):
+        n: int = int(random.uniform(4, 9))
+
+        graph = utils.create_random_graph(n)
+
+        _, optimal_cost = tsp.optimal_tsp(graph)
+
+        for solver in (tsp.held_karp_tsp, tsp.branch_and_bound_tsp):
+            tour, cost = solver(graph)
+
+            assert sorted(tour) == list(graph.nodes()), (
+                "Tour does not visit every node exactly once"
+            )
+
+            assert math.isclose(
+                utils.calculate_path_weight(graph, [*tour, tour[0]]), cost
+            ), "Tour weight does not match the returned cost"
+
+            assert math.isclose(cost, optimal_cost), (
+                f"{solver.__name__} did not find an optimal tour"
+            )
+
+    # Held-Karp refuses graphs whose subsets would not fit in memory
+    graph = utils.create_random_graph(tsp.HELD_KARP_MAX_NODES + 1)
+    try:
+        tsp.held_karp_tsp(graph)
+    except ValueError:
+        pass
+    else:
+        msg = "held_karp_tsp accepted a graph above its size limit"
+        raise AssertionError(msg)
+
+
+if __name__ == "__main__":
+    main()